@@ -1,2 +1,3 @@
 from .vertice import Vertice
-from .renderer import Renderer
\ No newline at end of file
+from .vertex_buffer import VertexBuffer
+from .renderer import Renderer
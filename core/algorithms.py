@@ -1,5 +1,6 @@
 import math 
 from core import Vertice
+from core.raster_stats import raster_stats
 
 def pseudo_rand(seed, a=12.9898, b=78.233):
     return abs(math.sin(seed * a) * b) % 1.0
@@ -15,6 +16,9 @@ def draw_line(renderer, v0: Vertice, v1: Vertice, color):
     sy = 1 if y1 < y2 else -1
     err = dx - dy
 
+    if raster_stats.enabled:
+        raster_stats.record('line', pixels=max(dx, dy) + 1)
+
     while True:
         renderer.put_pixel(x1, y1, color)
         if x1 == x2 and y1 == y2:
@@ -36,12 +40,14 @@ def draw_ellipse(renderer, center: Vertice, rx, ry, color):
     d1 = (ry**2) - (rx**2 * ry) + (0.25 * rx**2)
     dx = 2 * ry**2 * x
     dy = 2 * rx**2 * y
+    plotted = 0
 
     while dx < dy:
         renderer.put_pixel(xc + x, yc + y, color)
         renderer.put_pixel(xc - x, yc + y, color)
         renderer.put_pixel(xc + x, yc - y, color)
         renderer.put_pixel(xc - x, yc - y, color)
+        plotted += 4
 
         if d1 < 0:
             x += 1
@@ -61,6 +67,7 @@ def draw_ellipse(renderer, center: Vertice, rx, ry, color):
         renderer.put_pixel(xc - x, yc + y, color)
         renderer.put_pixel(xc + x, yc - y, color)
         renderer.put_pixel(xc - x, yc - y, color)
+        plotted += 4
 
         if d2 > 0:
             y -= 1
@@ -73,6 +80,9 @@ def draw_ellipse(renderer, center: Vertice, rx, ry, color):
             dy -= 2 * rx**2
             d2 += dx - dy + rx**2
 
+    if raster_stats.enabled:
+        raster_stats.record('ellipse', pixels=plotted)
+
 
 def flood_fill(
     renderer,
@@ -91,6 +101,7 @@ def flood_fill(
 
     visited = set()
     stack = [(x, y)]
+    filled = 0
 
     # 4-connected (nearest neighbors)
     neighbors_4 = [(1,0), (-1,0), (0,1), (0,-1)]
@@ -117,7 +128,11 @@ def flood_fill(
             continue
 
         renderer.put_pixel(cx, cy, fill_color)
+        filled += 1
 
         for dx, dy in neighbors:
             stack.append((cx + dx, cy + dy))
 
+    if raster_stats.enabled:
+        raster_stats.record('flood_fill', pixels=filled)
+
@@ -4,7 +4,9 @@ RIGHT  = 2
 BOTTOM = 4
 TOP    = 8
 
-from core import Vertice
+import numpy as np
+
+from core import Vertice, VertexBuffer
 
 def get_outcode(v, xmin, ymin, xmax, ymax):
     code = INSIDE
@@ -69,3 +71,23 @@ def cohen_sutherland_clip(v1, v2, xmin, ymin, xmax, ymax):
         else:
             v2 = new_v
             code2 = get_outcode(v2, xmin, ymin, xmax, ymax)
+
+
+def get_outcodes(buffer: VertexBuffer, xmin, ymin, xmax, ymax):
+    """Outcodes de todos os vértices do buffer de uma vez (mesmos bits de get_outcode)."""
+    codes = np.where(buffer.x < xmin, LEFT, np.where(buffer.x > xmax, RIGHT, INSIDE))
+    codes |= np.where(buffer.y < ymin, BOTTOM, np.where(buffer.y > ymax, TOP, INSIDE))
+    return codes
+
+
+def reject_parts(buffer: VertexBuffer, xmin, ymin, xmax, ymax):
+    """
+    Rejeição trivial por parte: uma parte está toda fora da janela quando
+    o AND dos outcodes dos seus vértices é diferente de zero.
+    Retorna uma lista de bools, uma por parte do buffer.
+    """
+    codes = get_outcodes(buffer, xmin, ymin, xmax, ymax)
+    starts = np.asarray(buffer.offsets[:-1])
+    if len(codes) == 0 or len(starts) == 0:
+        return []
+    return (np.bitwise_and.reduceat(codes, starts) != 0).tolist()
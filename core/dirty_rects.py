@@ -0,0 +1,104 @@
+import numpy as np
+import pygame
+
+class DirtyRectTracker:
+    """
+    Apresenta só o que mudou na tela desde o último quadro.
+    Os estados redesenham a tela inteira a cada quadro, então as regiões sujas
+    saem da comparação com o quadro anterior, em blocos de TILE x TILE pixels.
+    Blocos sujos vizinhos viram retângulos (faixas na horizontal, unidas na
+    vertical quando têm a mesma largura) e vão para pygame.display.update(rects).
+    Acima de FULL_THRESHOLD da tela suja, um flip completo sai mais barato.
+    Telas de 24 bits (sem view pixels2d) sempre vão com flip completo.
+    """
+    TILE = 32
+    FULL_THRESHOLD = 0.5 # Fração da tela suja a partir da qual faz flip completo
+
+    def __init__(self, width, height, tile=None, full_threshold=None):
+        self.width = width
+        self.height = height
+        self.tile = tile or self.TILE
+        self.full_threshold = self.FULL_THRESHOLD if full_threshold is None else full_threshold
+        # Último quadro apresentado e máscara de diferenças, em [y, x] (linhas contíguas
+        # como na superfície, o que deixa a comparação e a cópia bem mais rápidas)
+        self._previous = None # None = próximo quadro é completo
+        self._changed = np.empty((height, width), dtype=bool)
+        self.full_flips = 0
+        self.partial_updates = 0
+        self.skipped = 0 # Quadros idênticos ao anterior (nada a enviar)
+        self.last_coverage = 1.0
+
+    def invalidate(self):
+        """Força um flip completo no próximo quadro (ex.: janela redesenhada pelo sistema)."""
+        self._previous = None
+
+    def dirty_tiles(self, rows):
+        """Máscara [bloco_x, bloco_y] dos blocos com algum pixel diferente do quadro anterior."""
+        changed = np.not_equal(rows, self._previous, out=self._changed)
+        height, width = changed.shape
+        tile = self.tile
+
+        # Blocos de linhas (o resto da divisão vira um bloco menor)
+        full = height - height % tile
+        row_tiles = changed[:full].reshape(full // tile, tile, width).any(axis=1)
+        if full < height:
+            row_tiles = np.vstack([row_tiles, changed[full:].any(axis=0)])
+
+        # Blocos de colunas, completando a largura com False
+        pad = -width % tile
+        if pad:
+            row_tiles = np.pad(row_tiles, ((0, 0), (0, pad)))
+        return row_tiles.reshape(row_tiles.shape[0], -1, tile).any(axis=2).T
+
+    def merge(self, tiles):
+        """Retângulos (em pixels) cobrindo os blocos sujos."""
+        tile = self.tile
+        rects = []
+        open_runs = {} # (x0, x1) em blocos -> Rect que ainda cresce para baixo
+        for ty in range(tiles.shape[1]):
+            column = np.concatenate(([False], tiles[:, ty], [False]))
+            edges = np.flatnonzero(column[1:] != column[:-1])
+            runs = {}
+            for x0, x1 in zip(edges[0::2].tolist(), edges[1::2].tolist()):
+                rect = open_runs.get((x0, x1))
+                if rect is None:
+                    rect = pygame.Rect(x0 * tile, ty * tile, (x1 - x0) * tile, tile)
+                    rects.append(rect)
+                else:
+                    rect.height += tile
+                runs[(x0, x1)] = rect
+            open_runs = runs
+
+        screen = pygame.Rect(0, 0, self.width, self.height)
+        return [rect.clip(screen) for rect in rects]
+
+    def present(self, screen):
+        """Envia o quadro para a janela: update(rects) das regiões sujas ou flip completo."""
+        if screen.get_bytesize() == 3:
+            # Tela de 24 bits não tem view pixels2d: sem comparação, flip completo
+            self.full_flips += 1
+            self.last_coverage = 1.0
+            pygame.display.flip()
+            return
+
+        tiles = None
+        pixels = pygame.surfarray.pixels2d(screen)
+        try:
+            rows = pixels.T
+            if self._previous is None:
+                self._previous = rows.copy()
+            else:
+                tiles = self.dirty_tiles(rows)
+                np.copyto(self._previous, rows)
+        finally:
+            del pixels, rows
+
+        self.last_coverage = 1.0 if tiles is None else float(tiles.mean())
+        if self.last_coverage > self.full_threshold:
+            self.full_flips += 1
+            pygame.display.flip()
+        elif self.last_coverage == 0.0:
+            self.skipped += 1
+        else:
+            self.partial_updates += 1
+            pygame.display.update(self.merge(tiles))
@@ -0,0 +1,112 @@
+"""
+Visualização de overdraw (depuração, tecla F4 no jogo).
+
+Com uma superfície anexada, o Rasterizer e os blits do Renderer deixam de
+escrever cor nela: cada escrita soma 1 no contador do pixel (buffer NumPy).
+O put_pixel de linhas, elipses e flood fill também conta, mas continua
+pintando (o flood fill relê a tela para achar a borda).
+No fim da cena, draw() pinta o mapa de calor por cima da tela, mostrando
+quantas vezes cada pixel foi pintado (sem teste de profundidade, fundo,
+decorações, chão e entidades se sobrepõem de trás para frente).
+"""
+import numpy as np
+import pygame
+
+# Cor por número de escritas (índice); o último vale para "ou mais"
+PALETTE = np.array([
+    (0, 0, 0),        # 0: nada pintou o pixel
+    (20, 40, 140),    # 1
+    (20, 150, 60),    # 2
+    (200, 200, 30),   # 3
+    (240, 130, 20),   # 4
+    (220, 30, 30),    # 5
+    (255, 255, 255),  # 6+
+], dtype=np.uint8)
+
+class _CountingView:
+    """
+    Imita a view pixels[x, y] do surfarray: atribuir uma cor a um pixel,
+    fatia ou máscara só incrementa o contador das posições escritas.
+    """
+    __slots__ = ('counts',)
+
+    def __init__(self, counts):
+        self.counts = counts
+
+    @property
+    def shape(self):
+        return self.counts.shape
+
+    def __getitem__(self, key):
+        return _CountingView(self.counts[key])
+
+    def __setitem__(self, key, value):
+        self.counts[key] += 1
+
+class OverdrawBuffer:
+    def __init__(self):
+        self.surface = None # Superfície monitorada (None = modo desligado)
+        self.counts = None  # Escritas por pixel, indexado [x, y] como o surfarray
+
+    def attach(self, surface):
+        size = surface.get_size()
+        if self.counts is None or self.counts.shape != size:
+            self.counts = np.zeros(size, dtype=np.uint16)
+        else:
+            self.counts.fill(0)
+        self.surface = surface
+
+    def detach(self):
+        self.surface = None
+
+    def view(self, surface):
+        """View de contagem se a superfície estiver anexada, senão None."""
+        if surface is not self.surface: return None
+        return _CountingView(self.counts)
+
+    def count_blit(self, source, pos):
+        """Conta um blit: o retângulo inteiro, ou só os pixels não transparentes (SRCALPHA)."""
+        width, height = self.counts.shape
+        x, y = pos
+        w, h = source.get_size()
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(width, x + w), min(height, y + h)
+        if x0 >= x1 or y0 >= y1: return
+
+        region = self.counts[x0:x1, y0:y1]
+        if source.get_flags() & pygame.SRCALPHA:
+            alpha = pygame.surfarray.pixels_alpha(source)
+            region += alpha[x0 - x : x1 - x, y0 - y : y1 - y] > 0
+            del alpha
+        else:
+            region += 1
+
+    def count_pixel(self, x, y):
+        """Conta uma escrita de pixel avulso (put_pixel das primitivas de core.algorithms)."""
+        self.counts[x, y] += 1
+
+    def summary(self):
+        """(média de escritas por pixel pintado, máximo, fração da tela com 3+ escritas)."""
+        painted = self.counts[self.counts > 0]
+        if painted.size == 0:
+            return 0.0, 0, 0.0
+        return float(painted.mean()), int(painted.max()), float((self.counts >= 3).mean())
+
+    def draw(self, screen, font=None):
+        """Substitui a tela pelo mapa de calor (com legenda, se houver fonte)."""
+        heat = PALETTE[np.minimum(self.counts, len(PALETTE) - 1)]
+        pygame.surfarray.blit_array(screen, heat)
+        if font is None: return
+
+        x, y = 10, screen.get_height() - 30
+        for i, color in enumerate(PALETTE):
+            screen.fill((128, 128, 128), (x - 1, y - 1, 22, 22))
+            screen.fill(color.tolist(), (x, y, 20, 20))
+            label = f"{i}+" if i == len(PALETTE) - 1 else str(i)
+            screen.blit(font.render(label, True, (255, 255, 255)), (x + 24, y + 3))
+            x += 50
+        mean, peak, heavy = self.summary()
+        text = f"média {mean:.2f}x | máx {peak}x | 3+ escritas em {heavy:.0%} da tela"
+        screen.blit(font.render(text, True, (255, 255, 255)), (x + 10, y + 3))
+
+overdraw = OverdrawBuffer()
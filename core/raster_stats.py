@@ -0,0 +1,105 @@
+"""
+Contadores de trabalho do Rasterizer por tipo de primitiva e por quadro (opt-in).
+
+    raster_stats.enabled = True
+    ...                          # desenha o quadro
+    raster_stats.end_frame(largura * altura)
+    raster_stats.to_csv("stats.csv")
+
+Campos: chamadas, polígonos, scanlines, spans, pixels escritos e texels lidos.
+A linha 'total' de cada quadro traz o overdraw (pixels escritos / área da tela),
+que aponta camadas de tela cheia empilhadas (céu + montanhas + chão...).
+Desligado, cada primitiva só testa `raster_stats.enabled`.
+"""
+import csv
+import json
+from collections import deque
+
+FIELDS = ('calls', 'polygons', 'scanlines', 'spans', 'pixels', 'texels')
+
+class RasterStats:
+    MAX_FRAMES = 3600 # Quadros guardados (1 min a 60 FPS)
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.frame = 0
+        self.rows = deque() # Uma linha (dict) por primitiva por quadro
+        self._frame_rows = deque() # Quantas linhas cada quadro ocupa em rows
+        self._current = {}
+
+    def reset(self):
+        self.frame = 0
+        self.rows.clear()
+        self._frame_rows.clear()
+        self._current = {}
+
+    def record(self, primitive, polygons=0, scanlines=0, spans=0, pixels=0, texels=0):
+        counters = self._current.get(primitive)
+        if counters is None:
+            counters = self._current[primitive] = [0] * len(FIELDS)
+        counters[0] += 1
+        counters[1] += polygons
+        counters[2] += scanlines
+        counters[3] += spans
+        counters[4] += pixels
+        counters[5] += texels
+
+    def end_frame(self, screen_area=None):
+        """Fecha o quadro atual; com a área da tela, calcula o overdraw."""
+        if not self.enabled: return
+
+        totals = [0] * len(FIELDS)
+        rows = []
+        for primitive, counters in sorted(self._current.items()):
+            rows.append(self._row(primitive, counters, screen_area))
+            totals = [a + b for a, b in zip(totals, counters)]
+        rows.append(self._row('total', totals, screen_area))
+
+        self.rows.extend(rows)
+        self._frame_rows.append(len(rows))
+        while len(self._frame_rows) > self.MAX_FRAMES:
+            for _ in range(self._frame_rows.popleft()):
+                self.rows.popleft()
+
+        self._current = {}
+        self.frame += 1
+
+    def _row(self, primitive, counters, screen_area):
+        row = {'frame': self.frame, 'primitive': primitive}
+        row.update(zip(FIELDS, counters))
+        row['overdraw'] = round(counters[4] / screen_area, 3) if screen_area else None
+        return row
+
+    def summary(self):
+        """Média por quadro de cada campo, por primitiva."""
+        frames = len(self._frame_rows)
+        if not frames:
+            return {}
+        sums = {}
+        for row in self.rows:
+            acc = sums.setdefault(row['primitive'], dict.fromkeys(FIELDS + ('overdraw',), 0))
+            for field in FIELDS:
+                acc[field] += row[field]
+            acc['overdraw'] += row['overdraw'] or 0
+        return {primitive: {field: value / frames for field, value in acc.items()}
+                for primitive, acc in sums.items()}
+
+    def to_csv(self, path):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=('frame', 'primitive') + FIELDS + ('overdraw',))
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+    def to_json(self, path):
+        with open(path, 'w') as f:
+            json.dump({'frames': len(self._frame_rows), 'summary': self.summary(),
+                       'rows': list(self.rows)}, f, indent=1)
+
+    def export(self, path):
+        """Grava em CSV ou JSON conforme a extensão do arquivo."""
+        if path.lower().endswith('.json'):
+            self.to_json(path)
+        else:
+            self.to_csv(path)
+
+raster_stats = RasterStats()
@@ -1,94 +1,431 @@
+import math
+from operator import itemgetter
 import pygame
+import numpy as np
+
+from core.vertex_buffer import vertex_columns
+from core.raster_stats import raster_stats
+from core.overdraw import overdraw
+from core.texture import Texture
+
+class EdgeTable:
+    """
+    Tabela de Arestas (ET) de um polígono, montada uma única vez.
+    As arestas ficam em buckets indexados pela primeira scanline que cruzam (y_min).
+    O percurso usa a Tabela de Arestas Ativas (AET): a aresta entra no seu bucket,
+    avança x pela inclinação a cada scanline e sai ao atingir o seu y_max.
+    Cada aresta é uma lista [y_fim, x, dx] (y_fim exclusivo); com u/v ela vira
+    [y_fim, x, dx, u, du, v, dv, q, dq, origem]. Nesse caso x, u, v (e q) não
+    acumulam: saem da origem como lo + (y - y_lo) / dy * (hi - lo) em cada
+    scanline, igual ao scanline original, para a soma repetida não deslocar
+    as linhas de texels.
+    Com `ws` (w de cada vértice), interpola u/w, v/w e q = 1/w para a correção
+    de perspectiva (sem `ws`, q fica 0).
+    """
+    def __init__(self, vertices, with_uv=False, ws=None):
+        self.with_uv = with_uv or ws is not None
+        self.with_q = ws is not None
+        self.buckets = {}
+
+        if self.with_uv:
+            xs, ys, us, vs = vertex_columns(vertices, with_uv=True)
+        else:
+            xs, ys = vertex_columns(vertices)
+        if self.with_q:
+            qs = [1.0 / w for w in ws]
+            us = [u * q for u, q in zip(us, qs)]
+            vs = [v * q for v, q in zip(vs, qs)]
+
+        n = len(xs)
+        for i in range(n):
+            j = (i + 1) % n
+            if int(ys[i]) == int(ys[j]): continue
+
+            lo, hi = (i, j) if ys[i] < ys[j] else (j, i)
+            # Scanlines inteiras com y_lo <= y < y_hi
+            y_first = math.ceil(ys[lo])
+            y_end = math.ceil(ys[hi])
+            if y_first >= y_end: continue
+
+            dy = ys[hi] - ys[lo]
+            if not self.with_uv:
+                x = xs[lo] + (y_first - ys[lo]) * (xs[hi] - xs[lo]) / dy
+                self.buckets.setdefault(y_first, []).append([y_end, x, (xs[hi] - xs[lo]) / dy])
+                continue
+
+            q_lo, q_hi = (qs[lo], qs[hi]) if self.with_q else (0.0, 0.0)
+            origin = (ys[lo], dy, xs[lo], xs[hi] - xs[lo], us[lo], us[hi] - us[lo],
+                      vs[lo], vs[hi] - vs[lo], q_lo, q_hi - q_lo)
+            edge = [y_end, 0.0, origin[3] / dy, 0.0, origin[5] / dy, 0.0, origin[7] / dy,
+                    0.0, origin[9] / dy, origin]
+            self._evaluate(edge, y_first)
+            self.buckets.setdefault(y_first, []).append(edge)
+
+    @staticmethod
+    def _evaluate(edge, y):
+        """x, u, v e q da aresta na scanline y, a partir da origem (sem acumular erro)."""
+        y_lo, dy, x_lo, x_span, u_lo, u_span, v_lo, v_span, q_lo, q_span = edge[9]
+        factor = (y - y_lo) / dy
+        edge[1] = x_lo + factor * x_span
+        edge[3] = u_lo + factor * u_span
+        edge[5] = v_lo + factor * v_span
+        edge[7] = q_lo + factor * q_span
+
+    def scan(self, y_min, y_max):
+        """
+        Percorre as scanlines de y_min a y_max (inclusive) e gera (y, arestas ativas ordenadas por x).
+        Pares consecutivos da lista (0-1, 2-3, ...) delimitam os spans da linha.
+        """
+        active = []
+        # Arestas que começam acima da área visível entram já avançadas até y_min
+        for y_first, bucket in self.buckets.items():
+            if y_first < y_min:
+                for edge in bucket:
+                    if edge[0] > y_min:
+                        if not self.with_uv:
+                            edge[1] += edge[2] * (y_min - y_first)
+                        active.append(edge)
+
+        by_x = itemgetter(1)
+        buckets = self.buckets
+        with_uv = self.with_uv
+        evaluate = self._evaluate
+        next_exit = min((edge[0] for edge in active), default=y_max + 1)
+
+        for y in range(y_min, y_max + 1):
+            bucket = buckets.get(y)
+            if bucket:
+                active.extend(bucket)
+                next_exit = min(next_exit, min(edge[0] for edge in bucket))
+
+            # Retira as arestas que chegaram ao y_max
+            if next_exit <= y:
+                active = [edge for edge in active if edge[0] > y]
+                next_exit = min((edge[0] for edge in active), default=y_max + 1)
+            if not active: continue
+
+            if with_uv:
+                for edge in active:
+                    evaluate(edge, y)
+            active.sort(key=by_x)
+            yield y, active
+
+            if not with_uv:
+                for edge in active:
+                    edge[1] += edge[2]
 
 class Rasterizer:
+    # Polígonos baixos saem mais baratos linha a linha (_fill_rows); a partir
+    # desta altura (em scanlines) o cálculo em bloco com NumPy compensa o custo fixo.
+    BULK_MIN_ROWS = 56
+
+    # Endereçamento de textura fora de [0, 1]
+    WRAP = 'wrap'
+    CLAMP = 'clamp'
+
     @staticmethod
-    def scanline_fill(surface, vertices, color):
+    def _edge_table(xs, ys):
+        """
+        Monta a tabela de arestas do polígono uma única vez.
+        Cada aresta guarda o ponto de menor y (x_lo, y_lo), o y final e os deltas,
+        descartando as horizontais (mesmo critério do scanline original).
+        """
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        xs2 = np.concatenate((xs[1:], xs[:1]))
+        ys2 = np.concatenate((ys[1:], ys[:1]))
+
+        keep = np.trunc(ys) != np.trunc(ys2)
+        first_is_low = ys < ys2
+
+        x_lo = np.where(first_is_low, xs, xs2)[keep]
+        y_lo = np.where(first_is_low, ys, ys2)[keep]
+        x_hi = np.where(first_is_low, xs2, xs)[keep]
+        y_hi = np.where(first_is_low, ys2, ys)[keep]
+        return x_lo, y_lo, y_hi, x_hi - x_lo, y_hi - y_lo
+
+    @staticmethod
+    def _span_table(edges, y_min, y_max):
+        """
+        Calcula de uma vez todas as interseções de todas as scanlines.
+        Retorna, por linha, os pares (início, fim) já ordenados e a máscara dos pares válidos.
+        """
+        x_lo, y_lo, y_hi, dx, dy = edges
+        yy = np.arange(y_min, y_max + 1, dtype=float)[:, None]
+
+        active = (y_lo <= yy) & (yy < y_hi)
+        inter = np.where(active, x_lo + (yy - y_lo) * dx / dy, np.inf)
+        inter.sort(axis=1)
+
+        # Número par de colunas para separar os pares (início, fim)
+        if inter.shape[1] % 2:
+            inter = np.hstack([inter, np.full((inter.shape[0], 1), np.inf)])
+
+        counts = active.sum(axis=1)[:, None]
+        pair_idx = np.arange(inter.shape[1] // 2)[None, :]
+        valid = (2 * pair_idx + 1) < counts
+        return inter[:, 0::2], inter[:, 1::2], valid
+
+    @staticmethod
+    def _write_spans(pixels, y_min, starts, ends, valid, raw_color):
+        """
+        Escreve todos os spans de uma vez na view do surfarray (pixels[x, y]).
+        Usa um buffer de diferenças por linha: +1 no início, -1 depois do fim.
+        Retorna (scanlines, spans, pixels) escritos.
+        """
+        width = pixels.shape[0]
+        x_start = np.maximum(0, np.trunc(np.where(valid, starts, 0))).astype(np.int64)
+        x_end = np.minimum(width - 1, np.trunc(np.where(valid, ends, 0))).astype(np.int64)
+        valid = valid & (x_start < x_end)
+        if not valid.any(): return 0, 0, 0
+
+        rows, cols = np.nonzero(valid)
+        x_start, x_end = x_start[rows, cols], x_end[rows, cols]
+        x0, x1 = x_start.min(), x_end.max()
+
+        diff = np.zeros((starts.shape[0], x1 - x0 + 2), dtype=np.int32)
+        np.add.at(diff, (rows, x_start - x0), 1)
+        np.add.at(diff, (rows, x_end - x0 + 1), -1)
+        mask = np.cumsum(diff, axis=1)[:, :-1] > 0
+
+        target = pixels[x0 : x1 + 1, y_min : y_min + starts.shape[0]]
+        target[mask.T] = raw_color
+        # rows vem ordenado do nonzero: cada troca de valor é uma scanline nova
+        return int(np.count_nonzero(np.diff(rows))) + 1, len(rows), int((x_end - x_start + 1).sum())
+
+    @staticmethod
+    def _fill_active_spans(pixels, y, active, raw_color):
+        """
+        Preenche os spans de uma scanline a partir dos pares de arestas ativas da AET.
+        Retorna (spans, pixels) escritos.
+        """
+        width = pixels.shape[0]
+        spans = written = 0
+        for i in range(0, len(active) - 1, 2):
+            x_start = max(0, int(active[i][1]))
+            x_end = min(width - 1, int(active[i+1][1]))
+            if x_start < x_end:
+                pixels[x_start : x_end + 1, y] = raw_color
+                spans += 1
+                written += x_end - x_start + 1
+        return spans, written
+
+    @staticmethod
+    def _fill_rows(pixels, xs, ys, y_min, y_max, raw_color):
+        """
+        Scanline linha a linha para polígonos baixos: sem a montagem da AET nem
+        arrays NumPy. Cada aresta distribui as suas interseções pelas linhas
+        que cruza (x na linha pela mesma conta do scanline original).
+        Retorna (scanlines, spans, pixels) escritos.
+        """
+        width = pixels.shape[0]
+        rows = [[] for _ in range(y_max - y_min + 1)]
+        n = len(xs)
+        for i in range(n):
+            j = i + 1 if i + 1 < n else 0
+            y1, y2 = ys[i], ys[j]
+            if int(y1) == int(y2): continue
+            if y1 < y2:
+                y_lo, y_hi, x_lo, dx = y1, y2, xs[i], xs[j] - xs[i]
+            else:
+                y_lo, y_hi, x_lo, dx = y2, y1, xs[j], xs[i] - xs[j]
+            dy = y_hi - y_lo
+            # Scanlines inteiras com y_lo <= y < y_hi
+            for y in range(max(y_min, math.ceil(y_lo)), min(y_max + 1, math.ceil(y_hi))):
+                rows[y - y_min].append(x_lo + (y - y_lo) * dx / dy)
+
+        scanlines = spans = written = 0
+        for y, intersections in enumerate(rows, y_min):
+            if len(intersections) < 2: continue
+            intersections.sort()
+            row_spans = 0
+            for i in range(0, len(intersections) - 1, 2):
+                x_start = max(0, int(intersections[i]))
+                x_end = min(width - 1, int(intersections[i+1]))
+                if x_start < x_end:
+                    pixels[x_start : x_end + 1, y] = raw_color
+                    row_spans += 1
+                    written += x_end - x_start + 1
+            if row_spans:
+                scanlines += 1
+                spans += row_spans
+        return scanlines, spans, written
+
+    @staticmethod
+    def _fill_polygon(pixels, vertices, raw_color):
+        """Preenche um polígono sólido numa view já travada do surfarray (pixels[x, y])."""
         if len(vertices) < 3: return
 
-        width, height = surface.get_size()
-        ys = [v.y for v in vertices]
+        width, height = pixels.shape
+        xs, ys = vertex_columns(vertices)
         y_min = max(0, int(min(ys)))
         y_max = min(height - 1, int(max(ys)))
+        if y_min > y_max or max(xs) < 0 or min(xs) >= width: return
 
-        with pygame.PixelArray(surface) as pixels:
-            raw_color = surface.map_rgb(color)
-            
-            for y in range(y_min, y_max + 1):
-                intersections = []
-                for i in range(len(vertices)):
-                    v1, v2 = vertices[i], vertices[(i + 1) % len(vertices)]
-                    if int(v1.y) == int(v2.y): continue
-                    
-                    p1, p2 = (v1, v2) if v1.y < v2.y else (v2, v1)
-                    if p1.y <= y < p2.y:
-                        x = p1.x + (y - p1.y) * (p2.x - p1.x) / (p2.y - p1.y)
-                        intersections.append(x)
+        if y_max - y_min < Rasterizer.BULK_MIN_ROWS:
+            scanlines, spans, written = Rasterizer._fill_rows(pixels, xs, ys, y_min, y_max, raw_color)
+        else:
+            edges = Rasterizer._edge_table(xs, ys)
+            if len(edges[0]) == 0: return
+            starts, ends, valid = Rasterizer._span_table(edges, y_min, y_max)
+            scanlines, spans, written = Rasterizer._write_spans(pixels, y_min, starts, ends, valid, raw_color)
+
+        if raster_stats.enabled:
+            raster_stats.record('fill', polygons=1, scanlines=scanlines, spans=spans, pixels=written)
 
-                intersections.sort()
+    @staticmethod
+    def _pixels(surface):
+        """View pixels[x, y] da superfície (no modo overdraw, o contador de escritas)."""
+        counting = overdraw.view(surface)
+        return counting if counting is not None else pygame.surfarray.pixels2d(surface)
 
-                for i in range(0, len(intersections), 2):
-                    if i + 1 < len(intersections):
-                        x_start = max(0, int(intersections[i]))
-                        x_end = min(width - 1, int(intersections[i+1]))
-                        
-                        if x_start < x_end:
-                            pixels[x_start : x_end + 1, y] = raw_color
+    @staticmethod
+    def _map_color(surface, color):
+        """Cor no formato da superfície, sem sinal (map_rgb pode voltar negativo com alfa)."""
+        return surface.map_rgb(color) & 0xFFFFFFFF
 
     @staticmethod
-    def scanline_texture(surface, vertices, texture):
+    def scanline_fill(surface, vertices, color):
+        if len(vertices) < 3: return
+
+        pixels = Rasterizer._pixels(surface)
+        try:
+            Rasterizer._fill_polygon(pixels, vertices, Rasterizer._map_color(surface, color))
+        finally:
+            del pixels
+
+    @staticmethod
+    def fill_polygons(surface, polygons):
+        """
+        Preenche vários polígonos sólidos [(vertices, cor), ...] em ordem,
+        travando a superfície uma única vez para o lote inteiro.
+        """
+        if not polygons: return
+
+        raw_colors = {}
+        pixels = Rasterizer._pixels(surface)
+        try:
+            for vertices, color in polygons:
+                raw_color = raw_colors.get(color)
+                if raw_color is None:
+                    raw_color = raw_colors[color] = Rasterizer._map_color(surface, color)
+                Rasterizer._fill_polygon(pixels, vertices, raw_color)
+        finally:
+            del pixels
+
+    @staticmethod
+    def _ramp(start, step, count):
+        """
+        Rampa start, start+step, ... de um span inteiro, somada em sequência
+        (cumsum), igual ao `curr += d` do loop por pixel.
+        """
+        ramp = np.full(count, step)
+        ramp[0] = start
+        return np.cumsum(ramp)
+
+    @staticmethod
+    def _texel_index(coords, size, address):
+        """Coordenadas de textura (0..1) -> índices inteiros, com wrap ou clamp."""
+        index = np.trunc(coords * (size - 1)).astype(np.int64)
+        if address == Rasterizer.CLAMP:
+            return np.clip(index, 0, size - 1)
+        return index % size
+
+    @staticmethod
+    def _texels(texture):
+        """Texels brutos [x, y] da textura (cópia para formatos sem view direta, ex. 24 bits)."""
+        if texture.get_bytesize() == 3:
+            return pygame.surfarray.array2d(texture)
+        return pygame.surfarray.pixels2d(texture)
+
+    @staticmethod
+    def _span_level(texture, edge_a, edge_b, du, dv, perspective):
+        """
+        Nível de mipmap do span pelas derivadas de u/v na tela: em x vêm do próprio
+        span; em y, da aresta da esquerda descontado o deslocamento em x.
+        """
+        dx_dy = edge_a[2]
+        du_dy = edge_a[4] - du * dx_dy
+        dv_dy = edge_a[6] - dv * dx_dy
+        if perspective:
+            # Derivadas de u/w e v/w levadas a u e v pelo q médio do span (aproximação)
+            q = (edge_a[7] + edge_b[7]) * 0.5
+            du, dv, du_dy, dv_dy = du / q, dv / q, du_dy / q, dv_dy / q
+        return texture.level_for_derivatives(du, dv, du_dy, dv_dy)
+
+    @staticmethod
+    def scanline_texture(surface, vertices, texture, address=WRAP, ws=None):
+        """
+        Mapeamento de textura por span: as rampas de u/v de cada span saem de uma
+        vez com NumPy e os texels são copiados por arrays de índices.
+        address: WRAP repete a textura (u/v fora de [0, 1]), CLAMP estica a borda.
+        texture: Surface, ou Texture (mipmaps: o nível sai das derivadas de u/v por span).
+        ws: w de cada vértice para interpolar com correção de perspectiva (None = afim).
+        """
         if len(vertices) < 3: return
         
         width, height = surface.get_size()
-        tex_w, tex_h = texture.get_size()
+        mipmapped = isinstance(texture, Texture) and len(texture.levels) > 1
+        levels = texture.levels if isinstance(texture, Texture) else [texture]
+        perspective = ws is not None
         
-        ys = [v.y for v in vertices]
+        _, ys = vertex_columns(vertices)
         y_min = max(0, int(min(ys)))
         y_max = min(height - 1, int(max(ys)))
         
-        with pygame.PixelArray(surface) as pixels, pygame.PixelArray(texture) as tex_pixels:
-            for y in range(y_min, y_max + 1):
-                inter = []
-                for i in range(len(vertices)):
-                    v1, v2 = vertices[i], vertices[(i + 1) % len(vertices)]
-                    if int(v1.y) == int(v2.y): continue
-                    
-                    p1, p2 = (v1, v2) if v1.y < v2.y else (v2, v1)
-                    if p1.y <= y < p2.y:
-                        factor = (y - p1.y) / (p2.y - p1.y)
-                        x = p1.x + factor * (p2.x - p1.x)
-                        u = p1.u + factor * (p2.u - p1.u)
-                        v = p1.v + factor * (p2.v - p1.v)
-                        inter.append((x, u, v))
-
-                inter.sort(key=lambda item: item[0])
-
-                for i in range(0, len(inter), 2):
-                    if i + 1 >= len(inter): continue
-                    
-                    xa, ua, va = inter[i]
-                    xb, ub, vb = inter[i+1]
+        table = EdgeTable(vertices, with_uv=True, ws=ws)
+        scanlines = spans = written = 0
+        
+        pixels = Rasterizer._pixels(surface)
+        level_texels = {} # Nível -> texels, travados só quando usados
+        try:
+            for y, active in table.scan(y_min, y_max):
+                scanlines += 1
+                for i in range(0, len(active) - 1, 2):
+                    edge_a, edge_b = active[i], active[i+1]
+                    xa, ua, va = edge_a[1], edge_a[3], edge_a[5]
+                    xb, ub, vb = edge_b[1], edge_b[3], edge_b[5]
                     
                     x_start, x_end = int(xa), int(xb)
                     x_clamped_start = max(0, x_start)
                     x_clamped_end = min(width - 1, x_end)
                     
                     seg_w = x_end - x_start
-                    if seg_w <= 0: continue
+                    count = x_clamped_end - x_clamped_start + 1
+                    if seg_w <= 0 or count <= 0: continue
 
                     inv_w = 1.0 / seg_w
                     du = (ub - ua) * inv_w
                     dv = (vb - va) * inv_w
                     
                     offset = x_clamped_start - x_start
-                    curr_u = ua + offset * du
-                    curr_v = va + offset * dv
-
-                    for x in range(x_clamped_start, x_clamped_end + 1):
-                        tx = int(curr_u * (tex_w - 1)) % tex_w
-                        ty = int(curr_v * (tex_h - 1)) % tex_h
-                        pixels[x, y] = tex_pixels[tx, ty]
-                        curr_u += du
-                        curr_v += dv
+                    us = Rasterizer._ramp(ua + offset * du, du, count)
+                    vs = Rasterizer._ramp(va + offset * dv, dv, count)
+                    if perspective:
+                        # u/w e v/w são afins na tela; divide por q = 1/w interpolado
+                        dq = (edge_b[7] - edge_a[7]) * inv_w
+                        qs = Rasterizer._ramp(edge_a[7] + offset * dq, dq, count)
+                        us = us / qs
+                        vs = vs / qs
+
+                    level = Rasterizer._span_level(texture, edge_a, edge_b, du, dv, perspective) if mipmapped else 0
+                    texels = level_texels.get(level)
+                    if texels is None:
+                        texels = level_texels[level] = Rasterizer._texels(levels[level])
+
+                    tex_w, tex_h = texels.shape
+                    tx = Rasterizer._texel_index(us, tex_w, address)
+                    ty = Rasterizer._texel_index(vs, tex_h, address)
+                    pixels[x_clamped_start : x_clamped_end + 1, y] = texels[tx, ty]
+                    spans += 1
+                    written += count
+        finally:
+            del pixels
+            level_texels.clear()
+
+        if raster_stats.enabled:
+            # Amostragem por vizinho mais próximo: um texel por pixel (no nível escolhido)
+            raster_stats.record('texture', polygons=1, scanlines=scanlines, spans=spans, pixels=written, texels=written)
     
     @staticmethod
     def interpola_cor(color1, color2, factor):
@@ -104,33 +441,28 @@ class Rasterizer:
         if len(vertices) < 3: return
 
         width, height = surface.get_size()
-        ys = [v.y for v in vertices]
+        _, ys = vertex_columns(vertices)
         y_min = max(0, int(min(ys)))
         y_max = min(height - 1, int(max(ys)))
         
         poly_height = y_max - y_min
         if poly_height == 0: poly_height = 1
 
-        with pygame.PixelArray(surface) as pixels:
-            for y in range(y_min, y_max + 1):
+        table = EdgeTable(vertices)
+        scanlines = spans = written = 0
+        pixels = Rasterizer._pixels(surface)
+        try:
+            for y, active in table.scan(y_min, y_max):
                 factor = (y - y_min) / poly_height
                 current_color = Rasterizer.interpola_cor(color_top, color_bottom, factor)
-                raw_color = surface.map_rgb(current_color)
-                
-                intersections = []
-                for i in range(len(vertices)):
-                    v1, v2 = vertices[i], vertices[(i + 1) % len(vertices)]
-                    if int(v1.y) == int(v2.y): continue
-                    p1, p2 = (v1, v2) if v1.y < v2.y else (v2, v1)
-                    if p1.y <= y < p2.y:
-                        x = p1.x + (y - p1.y) * (p2.x - p1.x) / (p2.y - p1.y)
-                        intersections.append(x)
-
-                intersections.sort()
-
-                for i in range(0, len(intersections), 2):
-                    if i + 1 < len(intersections):
-                        x_start = max(0, int(intersections[i]))
-                        x_end = min(width - 1, int(intersections[i+1]))
-                        if x_start < x_end:
-                            pixels[x_start : x_end + 1, y] = raw_color
\ No newline at end of file
+                raw_color = Rasterizer._map_color(surface, current_color)
+
+                row_spans, row_written = Rasterizer._fill_active_spans(pixels, y, active, raw_color)
+                scanlines += 1
+                spans += row_spans
+                written += row_written
+        finally:
+            del pixels
+
+        if raster_stats.enabled:
+            raster_stats.record('gradient', polygons=1, scanlines=scanlines, spans=spans, pixels=written)
@@ -1,11 +1,17 @@
+import contextlib
+import math
 import pygame
 import numpy as np
 
 from math_utils.matrix import Matrix3x3
-from core.vertice import Vertice
 from core.rasterizer import Rasterizer
 from core.algorithms import draw_line, draw_ellipse, flood_fill
-from core.clipping import cohen_sutherland_clip
+from core.clipping import cohen_sutherland_clip, reject_parts
+from core.sprite_cache import SpriteCache
+from core.texture_cache import TextureCache
+from core.dirty_rects import DirtyRectTracker
+from core.raster_stats import raster_stats
+from core.overdraw import overdraw
 
 TILE_WIDTH = 256
 
@@ -14,11 +20,67 @@ class Renderer:
         self.width = width
         self.height = height
         self.screen = pygame.display.set_mode((width, height))
-        self._texture_cache = {} # Cache de texturas
+        self.texture_cache = TextureCache() # Fatias de textura escaladas (fundo)
+        self._batch = None # Polígonos sólidos pendentes (None = fora de lote)
+        self.sprite_cache = SpriteCache() # None desliga os sprites pré-rasterizados
+        self.dirty_rects = DirtyRectTracker(width, height) # None = sempre flip completo
+        self.cull_stats = {'drawn': 0, 'culled': 0} # Contadores do quadro atual
+        self.interpolation = 1.0 # alpha do passo fixo (1.0 = posição atual)
+
+    def reset_stats(self):
+        self.cull_stats['drawn'] = 0
+        self.cull_stats['culled'] = 0
+
+    # --- LOTE DE POLÍGONOS ---
+    # Entre begin_batch() e flush() os polígonos sólidos são acumulados e
+    # rasterizados de uma vez, com uma única trava da tela.
+    # Desenhos que não entram no lote (texturas, gradientes, blits) descarregam
+    # o que estiver pendente antes, preservando a ordem de pintura.
+
+    def begin_batch(self):
+        self._batch = []
+
+    def submit(self, vertices, color):
+        if self._batch is None:
+            Rasterizer.scanline_fill(self.screen, vertices, color)
+        else:
+            self._batch.append((vertices, color))
+
+    def flush(self):
+        self._drain_batch()
+        self._batch = None
+
+    def drain(self):
+        """Rasteriza o que estiver pendente no lote sem encerrá-lo (ex.: medir um estágio)."""
+        self._drain_batch()
+
+    def _drain_batch(self):
+        if self._batch:
+            Rasterizer.fill_polygons(self.screen, self._batch)
+            self._batch = []
+
+    # --- OVERDRAW (depuração) ---
+    # Entre begin_overdraw() e end_overdraw() o rasterizador e os blits só
+    # contam escritas por pixel (put_pixel conta e pinta); end_overdraw()
+    # pinta o mapa de calor na tela.
+
+    def begin_overdraw(self):
+        self._drain_batch()
+        overdraw.attach(self.screen)
+
+    def end_overdraw(self, font=None):
+        self._drain_batch()
+        overdraw.detach()
+        overdraw.draw(self.screen, font)
 
     def put_pixel(self, x, y, color):
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.screen.set_at((int(x), int(y)), color)
+            x, y = int(x), int(y)
+            self.screen.set_at((x, y), color)
+            # Pinta mesmo no overdraw: flood_fill lê a borda de volta da tela
+            # (o mapa de calor substitui a tela inteira no fim)
+            if overdraw.surface is self.screen:
+                overdraw.count_pixel(x, y)
             
     def draw_primitive_line(self, v1, v2, color):
             clipped = cohen_sutherland_clip(v1, v2, 0, 0, self.width-1, self.height-1)
@@ -41,9 +103,28 @@ class Renderer:
             use_nearest_neighbors=True
         )
     
-    def render_texture_polygon(self, vertices, texture):
-        Rasterizer.scanline_texture(self.screen, vertices, texture)
+    def render_texture_polygon(self, vertices, texture, address=Rasterizer.WRAP, ws=None):
+        self._drain_batch()
+        Rasterizer.scanline_texture(self.screen, vertices, texture, address, ws)
         
+    def render_gradient_polygon(self, vertices, color_top, color_bottom):
+        self._drain_batch()
+        Rasterizer.scanline_fill_gradiente(self.screen, vertices, color_top, color_bottom)
+
+    @contextlib.contextmanager
+    def render_target(self, surface):
+        """Desenha em `surface` em vez da tela (ex.: camadas estáticas guardadas em cache)."""
+        self._drain_batch()
+        screen, size = self.screen, (self.width, self.height)
+        self.screen = surface
+        self.width, self.height = surface.get_size()
+        try:
+            yield surface
+        finally:
+            self._drain_batch()
+            self.screen = screen
+            self.width, self.height = size
+
     def get_pixel(self, x, y):
         if 0 <= x < self.width and 0 <= y < self.height:
             return tuple(self.screen.get_at((int(x), int(y))))[:3]
@@ -51,78 +132,112 @@ class Renderer:
 
     @staticmethod
     def trasladar(entityposx, entityposy):
-        T = Matrix3x3.translation(entityposx, entityposy)
-        return Matrix3x3.combine([T])
+        return Matrix3x3.translation(entityposx, entityposy)
 
     def render_entity(self, entity, camera):
-        master_matrix = Renderer.trasladar(entity.pos[0], entity.pos[1])
-        for part in entity.parts:
-            world_vertices = Matrix3x3.apply_transform(part['vertices'], master_matrix)
-            screen_vertices = [camera.world_to_device(v) for v in world_vertices]
+        if not entity.parts: return
+
+        x, y = entity.interpolated_pos(self.interpolation)
+
+        # Culling pela caixa envolvente antes de qualquer transformação
+        if not camera.is_visible(entity.world_bounds((x, y))):
+            self.cull_stats['culled'] += 1
+            return
+        self.cull_stats['drawn'] += 1
+
+        # Modelo -> Mundo -> Tela numa única matriz (em cache na câmera) aplicada
+        # de uma vez ao buffer com todas as partes da entidade
+        device_matrix = camera.model_view(x, y)
+
+        # Entidades com sprite_key() são rasterizadas uma vez e só recebem blit
+        key = entity.sprite_key() if self.sprite_cache is not None else None
+        if key is not None:
+            sprite = self.sprite_cache.get(entity, key, device_matrix)
+            if sprite is not None:
+                self._blit_sprite(sprite, device_matrix)
+                return
+
+        screen_buffer = camera.buffer_to_device(entity.vertex_buffer(), device_matrix)
+        rejected = reject_parts(screen_buffer, 0, 0, self.width - 1, self.height - 1)
+
+        for i, part in enumerate(entity.parts):
+            if rejected[i]: continue
+            screen_vertices = screen_buffer.part(i)
             
             if part.get('texture') is not None:
-                Rasterizer.scanline_texture(self.screen, screen_vertices, part['texture'])
+                self.render_texture_polygon(screen_vertices, part['texture'], part.get('address', Rasterizer.WRAP))
             else:
-                Rasterizer.scanline_fill(self.screen, screen_vertices, part['color'])
+                self.submit(screen_vertices, part['color'])
+
+    def _blit_sprite(self, sprite, device_matrix):
+        surface, offset_x, offset_y = sprite
+        x = math.floor(device_matrix[0, 2]) + offset_x
+        y = math.floor(device_matrix[1, 2]) + offset_y
+        w, h = surface.get_size()
+        if x >= self.width or y >= self.height or x + w <= 0 or y + h <= 0: return
+
+        self._drain_batch()
+        self._blit(surface, (x, y))
+
+    def _blit(self, surface, pos):
+        if overdraw.surface is self.screen:
+            overdraw.count_blit(surface, pos)
+            return
+        rect = self.screen.blit(surface, pos)
+        if raster_stats.enabled:
+            raster_stats.record('blit', pixels=rect.width * rect.height)
 
     def render_background(self, bg_entity, camera):
         cam_x = camera.world_window['x_min']
         offset_x = bg_entity.pos[0] - cam_x * bg_entity.parallax
     
-        if offset_x < -800 or offset_x > self.width:
+        # Culling na tela (o parallax desloca o tile em relação à câmera)
+        shift = cam_x * bg_entity.parallax
+        x_min, _, x_max, _ = bg_entity.world_bounds()
+        if x_max - shift < 0 or x_min - shift >= self.width:
+            self.cull_stats['culled'] += 1
             return
+        self.cull_stats['drawn'] += 1
+
+        model_buffer = bg_entity.vertex_buffer()
+        screen_buffer = model_buffer.translated(offset_x, bg_entity.pos[1])
 
-        for part in bg_entity.parts:
+        for i, part in enumerate(bg_entity.parts):
             texture = part.get('texture')
+            screen_vertices = screen_buffer.part(i)
             
             if texture:
-                # OTIMIZAÇÃO: Blit direto com cache
-                vertices = part['vertices']
-                # Calcula bounding box
-                x_min = min(v.x for v in vertices) + offset_x
-                y_min = min(v.y for v in vertices) + bg_entity.pos[1]
-                x_max = max(v.x for v in vertices) + offset_x
-                y_max = max(v.y for v in vertices) + bg_entity.pos[1]
-                
-                width = int(x_max - x_min)
-                height = int(y_max - y_min)
-                
-                if width > 0 and height > 0:
-                    u_min, u_max = min(v.u for v in vertices), max(v.u for v in vertices)
-                    v_min, v_max = min(v.v for v in vertices), max(v.v for v in vertices)
-                    
-                    cache_key = (id(texture), u_min, u_max, v_min, v_max, width, height)
-                    
-                    if cache_key not in self._texture_cache:
-                        tex_w, tex_h = texture.get_size()
-                        src_x = int(u_min * tex_w)
-                        src_y = int(v_min * tex_h)
-                        src_w = int((u_max - u_min) * tex_w)
-                        src_h = int((v_max - v_min) * tex_h)
-                        
-                        if src_w > 0 and src_h > 0:
-                            try:
-                                sub_texture = texture.subsurface((src_x, src_y, src_w, src_h))
-                                scaled = pygame.transform.scale(sub_texture, (width, height))
-                                self._texture_cache[cache_key] = scaled
-                            except:
-                                self._texture_cache[cache_key] = None
-                    
-                    cached_texture = self._texture_cache.get(cache_key)
-                    if cached_texture:
-                        self.screen.blit(cached_texture, (int(x_min), int(y_min)))
-                    elif 'color' in part:
-                        screen_vertices = [Vertice(v.x + offset_x, v.y + bg_entity.pos[1], v.u, v.v) for v in vertices]
-                        Rasterizer.scanline_fill(self.screen, screen_vertices, part['color'])
+                # OTIMIZAÇÃO: Blit direto da fatia já escalada (cache LRU por bytes)
+                cached_texture = self.texture_cache.get(texture, model_buffer.part(i))
+                if cached_texture:
+                    x_min, y_min, _, _ = screen_vertices.bounds()
+                    self._drain_batch()
+                    self._blit(cached_texture, (int(x_min), int(y_min)))
+                elif 'color' in part:
+                    self.submit(screen_vertices, part['color'])
             
             elif 'gradient' in part:
                 # SUPORTE A GRADIENTE (Montanhas)
-                screen_vertices = [Vertice(v.x + offset_x, v.y + bg_entity.pos[1], v.u, v.v) for v in part['vertices']]
-                Rasterizer.scanline_fill_gradiente(self.screen, screen_vertices, part['gradient']['top'], part['gradient']['bottom'])
+                self.render_gradient_polygon(screen_vertices, part['gradient']['top'], part['gradient']['bottom'])
             
             elif 'color' in part:
-                screen_vertices = [Vertice(v.x + offset_x, v.y + bg_entity.pos[1], v.u, v.v) for v in part['vertices']]
-                Rasterizer.scanline_fill(self.screen, screen_vertices, part['color'])
+                self.submit(screen_vertices, part['color'])
+
+    def invalidate_display(self):
+        """Próximo render_step apresenta a tela inteira (ex.: janela exposta de novo)."""
+        if self.dirty_rects is not None: self.dirty_rects.invalidate()
 
-    def render_step(self):
-        pygame.display.flip()
\ No newline at end of file
+    def render_step(self, track_dirty=True):
+        """
+        Apresenta o quadro. track_dirty=False para telas que mudam quase inteiras
+        todo quadro (ex.: jogo com a câmera andando): flip direto, sem o custo de
+        comparar e copiar a tela, e o próximo quadro rastreado vai inteiro.
+        """
+        self.flush()
+        if self.dirty_rects is None:
+            pygame.display.flip()
+        elif not track_dirty:
+            self.dirty_rects.invalidate()
+            pygame.display.flip()
+        else:
+            self.dirty_rects.present(self.screen)
\ No newline at end of file
@@ -0,0 +1,74 @@
+import math
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+from core.rasterizer import Rasterizer
+
+class SpriteCache:
+    """
+    Cache de sprites pré-rasterizados.
+    Uma entidade (ou pose) que informa `sprite_key()` é rasterizada uma única vez
+    pelo nosso Rasterizer numa superfície SRCALPHA fora da tela; nos quadros
+    seguintes basta um blit. A chave inclui a escala da câmera (zoom), então
+    trocar o zoom gera sprites novos. Descarte LRU por número de entradas.
+    """
+    MAX_ENTRIES = 256
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self._sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def clear(self):
+        self._sprites.clear()
+
+    def get(self, entity, key, device_matrix):
+        """
+        Retorna (superfície, offset_x, offset_y) do sprite da entidade na escala
+        de `device_matrix`, ou None se ela não puder ser pré-rasterizada (texturas).
+        O offset é o canto do sprite relativo à origem da entidade na tela.
+        """
+        sx, sy = float(device_matrix[0, 0]), float(device_matrix[1, 1])
+        full_key = (key, sx, sy)
+        sprites = self._sprites
+        if full_key in sprites:
+            sprites.move_to_end(full_key)
+            self.hits += 1
+            return sprites[full_key]
+
+        self.misses += 1
+        sprite = sprites[full_key] = self._rasterize(entity, sx, sy)
+        if len(sprites) > self.max_entries:
+            sprites.popitem(last=False)
+        return sprite
+
+    @staticmethod
+    def _rasterize(entity, sx, sy):
+        if any(part.get('texture') is not None for part in entity.parts):
+            return None
+
+        buffer = entity.vertex_buffer()
+        x_min, y_min, x_max, y_max = buffer.transformed(np.diag([sx, sy, 1.0])).bounds()
+        ox, oy = math.floor(x_min), math.floor(y_min)
+        size = (math.ceil(x_max) - ox + 1, math.ceil(y_max) - oy + 1)
+
+        # Modelo -> sprite: escala da câmera e canto superior esquerdo em (0, 0)
+        local = buffer.transformed(np.array([[sx, 0.0, -ox], [0.0, sy, -oy], [0.0, 0.0, 1.0]]), truncate=True)
+
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        solids = []
+        for i, part in enumerate(entity.parts):
+            if 'gradient' in part:
+                Rasterizer.fill_polygons(surface, solids)
+                solids = []
+                Rasterizer.scanline_fill_gradiente(surface, local.part(i), part['gradient']['top'], part['gradient']['bottom'])
+            else:
+                solids.append((local.part(i), part['color']))
+        Rasterizer.fill_polygons(surface, solids)
+        return surface, ox, oy
@@ -0,0 +1,36 @@
+import math
+import pygame
+
+class Texture:
+    """
+    Textura com cadeia de mipmaps: levels[0] é a superfície original e cada
+    nível seguinte tem metade da largura e da altura (filtrado com smoothscale),
+    até min_size. Reduções (céu encolhido, câmera com zoom out) leem o nível
+    cujo texel tem ~1 pixel de tela, com bem menos texels e sem aliasing.
+    Onde uma Surface é esperada, use levels[0] (ou get_size()).
+    """
+    def __init__(self, surface, min_size=1):
+        self.levels = [surface]
+        w, h = surface.get_size()
+        while w // 2 >= min_size and h // 2 >= min_size:
+            w, h = w // 2, h // 2
+            self.levels.append(pygame.transform.smoothscale(self.levels[-1], (w, h)))
+
+    @property
+    def surface(self):
+        return self.levels[0]
+
+    def get_size(self):
+        return self.levels[0].get_size()
+
+    def level_for(self, rho):
+        """Nível para `rho` texels (do nível 0) por pixel de tela: round(log2(rho)), limitado à cadeia."""
+        if rho <= 1.0: return 0
+        return min(int(math.log2(rho) + 0.5), len(self.levels) - 1)
+
+    def level_for_derivatives(self, du_dx, dv_dx, du_dy, dv_dy):
+        """Nível pelas derivadas de u/v em x e y de tela (maior eixo, como no OpenGL)."""
+        tex_w, tex_h = self.get_size()
+        rho = max(math.hypot(du_dx * tex_w, dv_dx * tex_h),
+                  math.hypot(du_dy * tex_w, dv_dy * tex_h))
+        return self.level_for(rho)
@@ -0,0 +1,127 @@
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+from core.texture import Texture
+
+class TextureCache:
+    """
+    Cache das fatias de textura já escaladas para o tamanho de tela (céu dos
+    BackgroundTiles), com orçamento em bytes e descarte LRU.
+    A chave é (id da textura, u/v quantizados, largura, altura); cada entrada
+    guarda uma referência fraca da textura de origem, então um id reaproveitado
+    por outra textura nunca devolve a fatia antiga, e liberar a textura
+    descarta as fatias dela.
+    """
+    MAX_BYTES = 32 * 1024 * 1024
+    UV_STEPS = 4096 # Quantização de u/v na chave (1/4096 da textura)
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes or self.MAX_BYTES
+        self._entries = OrderedDict() # chave -> (ref da textura, fatia ou None, bytes)
+        self._refs = {} # id da textura -> weakref (com callback de descarte)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self._refs.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {'entries': len(self._entries), 'bytes': self.bytes, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
+
+    @staticmethod
+    def slice_params(part_buffer):
+        """((u_min, u_max, v_min, v_max), (largura, altura)) de uma parte texturizada."""
+        x_min, y_min, x_max, y_max = part_buffer.bounds()
+        uv = (float(part_buffer.u.min()), float(part_buffer.u.max()),
+              float(part_buffer.v.min()), float(part_buffer.v.max()))
+        return uv, (int(x_max - x_min), int(y_max - y_min))
+
+    def get(self, texture, part_buffer):
+        """
+        Fatia da textura coberta pela parte, escalada para o tamanho dela na tela.
+        O tamanho sai do buffer do modelo (a translação não muda a chave).
+        None se a fatia não existir (tamanho nulo ou u/v fora da textura).
+        """
+        uv, size = self.slice_params(part_buffer)
+        if size[0] <= 0 or size[1] <= 0: return None
+
+        steps = self.UV_STEPS
+        key = (id(texture),) + tuple(round(value * steps) for value in uv) + size
+        entries = self._entries
+        entry = entries.get(key)
+        if entry is not None and entry[0]() is texture:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        if entry is not None: self._remove(key)
+
+        surface = self._scale(texture, uv, size)
+        nbytes = surface.get_bytesize() * size[0] * size[1] if surface is not None else 0
+        entries[key] = (self._ref(texture), surface, nbytes)
+        self.bytes += nbytes
+
+        while self.bytes > self.max_bytes and len(entries) > 1:
+            self._remove(next(iter(entries)))
+            self.evictions += 1
+        return surface
+
+    def prewarm(self, tiles):
+        """Escala de antemão as fatias texturizadas dos tiles (ex.: céu do level novo)."""
+        for tile in tiles:
+            buffer = tile.vertex_buffer()
+            for i, part in enumerate(tile.parts):
+                if part.get('texture') is not None:
+                    self.get(part['texture'], buffer.part(i))
+
+    def _remove(self, key):
+        _, _, nbytes = self._entries.pop(key)
+        self.bytes -= nbytes
+
+    def _ref(self, texture):
+        ref = self._refs.get(id(texture))
+        if ref is None or ref() is not texture:
+            texture_id = id(texture)
+            ref = self._refs[texture_id] = weakref.ref(texture, lambda dead, tid=texture_id: self._forget(tid, dead))
+        return ref
+
+    def _forget(self, texture_id, dead_ref):
+        """Textura liberada: descarta as fatias dela."""
+        if self._refs.get(texture_id) is dead_ref:
+            del self._refs[texture_id]
+        for key in [key for key, entry in self._entries.items() if entry[0] is dead_ref]:
+            self._remove(key)
+
+    @staticmethod
+    def _scale(texture, uv, size):
+        u_min, u_max, v_min, v_max = uv
+        width, height = size
+        source = texture
+        if isinstance(texture, Texture):
+            # Reduzindo, lê do nível de mipmap com ~1 texel por pixel
+            tex_w, tex_h = texture.get_size()
+            rho = max((u_max - u_min) * tex_w / width, (v_max - v_min) * tex_h / height)
+            source = texture.levels[texture.level_for(rho)]
+
+        tex_w, tex_h = source.get_size()
+        src_x = int(u_min * tex_w)
+        src_y = int(v_min * tex_h)
+        src_w = int((u_max - u_min) * tex_w)
+        src_h = int((v_max - v_min) * tex_h)
+        if src_w <= 0 or src_h <= 0: return None
+
+        try:
+            return pygame.transform.scale(source.subsurface((src_x, src_y, src_w, src_h)), size)
+        except ValueError:
+            return None
@@ -0,0 +1,101 @@
+import numpy as np
+
+from .vertice import Vertice
+
+class VertexBuffer:
+    """
+    Vértices de um ou mais polígonos em estrutura de arrays (SoA):
+    x, y, u, v ficam em arrays float contíguos e `offsets` marca onde
+    começa cada parte (offsets[i]..offsets[i+1]).
+    Iterar ou indexar o buffer devolve Vertices, para compatibilidade.
+    """
+    __slots__ = ('x', 'y', 'u', 'v', 'offsets')
+
+    def __init__(self, x, y, u=None, v=None, offsets=None):
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.u = np.zeros(len(self.x)) if u is None else np.asarray(u, dtype=float)
+        self.v = np.zeros(len(self.x)) if v is None else np.asarray(v, dtype=float)
+        self.offsets = (0, len(self.x)) if offsets is None else tuple(offsets)
+
+    @classmethod
+    def from_vertices(cls, vertices):
+        """Uma única parte a partir de uma lista de Vertices."""
+        return cls.from_parts([vertices])
+
+    @classmethod
+    def from_parts(cls, parts):
+        """Empacota várias listas de Vertices num buffer só, guardando os offsets."""
+        offsets = [0]
+        flat = []
+        for vertices in parts:
+            flat.extend((v.x, v.y, v.u, v.v) for v in vertices)
+            offsets.append(len(flat))
+
+        data = np.array(flat, dtype=float).reshape(-1, 4)
+        return cls(data[:, 0], data[:, 1], data[:, 2], data[:, 3], offsets)
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, i):
+        return Vertice(float(self.x[i]), float(self.y[i]), float(self.u[i]), float(self.v[i]))
+
+    def __iter__(self):
+        for x, y, u, v in zip(self.x.tolist(), self.y.tolist(), self.u.tolist(), self.v.tolist()):
+            yield Vertice(x, y, u, v)
+
+    @property
+    def part_count(self):
+        return len(self.offsets) - 1
+
+    def part(self, i):
+        """View (sem cópia) da i-ésima parte."""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return VertexBuffer(self.x[start:end], self.y[start:end],
+                            self.u[start:end], self.v[start:end])
+
+    def homogeneous(self):
+        """Bloco (N,3) de coordenadas homogêneas (x, y, 1)."""
+        coords = np.ones((len(self.x), 3))
+        coords[:, 0] = self.x
+        coords[:, 1] = self.y
+        return coords
+
+    def transformed(self, matrix, truncate=False):
+        """
+        Novo buffer com todas as partes transformadas por uma matriz 3x3 afim
+        (uma única operação para o buffer inteiro). u, v são compartilhados.
+        """
+        a, b, c = matrix[0]
+        d, e, f = matrix[1]
+        x = a * self.x + b * self.y + c
+        y = d * self.x + e * self.y + f
+        if truncate:
+            x = np.trunc(x)
+            y = np.trunc(y)
+        return VertexBuffer(x, y, self.u, self.v, self.offsets)
+
+    def translated(self, dx, dy):
+        return VertexBuffer(self.x + dx, self.y + dy, self.u, self.v, self.offsets)
+
+    def bounds(self):
+        """Caixa envolvente (x_min, y_min, x_max, y_max)."""
+        return (float(self.x.min()), float(self.y.min()),
+                float(self.x.max()), float(self.y.max()))
+
+def vertex_columns(vertices, with_uv=False):
+    """
+    Colunas de floats do Python (xs, ys[, us, vs]) de uma lista de Vertices
+    ou de um VertexBuffer, para os laços escalares do rasterizador.
+    """
+    if isinstance(vertices, VertexBuffer):
+        columns = (vertices.x.tolist(), vertices.y.tolist())
+        if with_uv:
+            columns += (vertices.u.tolist(), vertices.v.tolist())
+        return columns
+
+    columns = ([v.x for v in vertices], [v.y for v in vertices])
+    if with_uv:
+        columns += ([v.u for v in vertices], [v.v for v in vertices])
+    return columns
@@ -1,4 +1,7 @@
 class Vertice:
+    # Sem __dict__ por instância: os modelos criam centenas destes por quadro
+    __slots__ = ('x', 'y', 'u', 'v')
+
     def __init__(self, x, y, u=0.0, v=0.0):
         self.x = x
         self.y = y
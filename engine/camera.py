@@ -1,5 +1,5 @@
 import numpy as np
-from core import Vertice
+from core import Vertice, VertexBuffer
 from math_utils.matrix import Matrix3x3 
 
 class Camera():
@@ -20,12 +20,39 @@ class Camera():
         self.screen_height = screen_height
         self.zoom_level = 1.0
         
-        # Inicializa a matriz de identidade
-        self.transform_matrix = Matrix3x3.identity()
+        # Cache da matriz: só é recomposta quando a janela/viewport muda (dirty).
+        # A versão aumenta a cada recomposição e invalida as matrizes Modelo-Vista.
+        self.version = 0
+        self._dirty = True
+        self._matrix = Matrix3x3.identity()
+        self._affine = (1.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+        self._model_view_cache = {}
+        self._model_view_version = -1
         
         # Calcula a primeira matriz
         self._update_transformation_matrix()
 
+    # Limite de entradas do cache Modelo-Vista (entidades distintas por quadro)
+    MODEL_VIEW_CACHE_SIZE = 512
+
+    @property
+    def transform_matrix(self):
+        if self._dirty:
+            self._update_transformation_matrix()
+        return self._matrix
+
+    def _mark_dirty(self):
+        self._dirty = True
+
+    def _set_window(self, x_min, x_max, y_min, y_max):
+        window = self.world_window
+        if (window['x_min'] == x_min and window['x_max'] == x_max and
+                window['y_min'] == y_min and window['y_max'] == y_max):
+            return
+        window['x_min'], window['x_max'] = x_min, x_max
+        window['y_min'], window['y_max'] = y_min, y_max
+        self._mark_dirty()
+
     def _update_transformation_matrix(self):
         """
         Recalcula a matriz World-to-Viewport baseada na teoria da Aula 11 (Slide 18).
@@ -67,7 +94,12 @@ class Camera():
         # Para garantir: M = T2 @ S @ T1
         
         m_temp = np.dot(s, t1)        # S * T1
-        self.transform_matrix = np.dot(t2, m_temp) # T2 * (S * T1)
+        self._matrix = np.dot(t2, m_temp) # T2 * (S * T1)
+        
+        (a, b, c), (d, e, f), _ = self._matrix.tolist()
+        self._affine = (a, b, c, d, e, f)
+        self._dirty = False
+        self.version += 1
 
     def set_zoom(self, level):
         self.zoom_level = level
@@ -76,16 +108,15 @@ class Camera():
         center_y = (self.world_window['y_min'] + self.world_window['y_max']) / 2
         
         # Recalcula tamanho da janela baseado no zoom
+        # (a matriz é recomposta no próximo uso, se a janela mudou)
         self._update_window_size(center_x, center_y)
-        
-        # Importante: Atualizar a matriz após mudar a janela
-        self._update_transformation_matrix()
 
-    def follow(self, target_entity):
+    def follow(self, target_entity, alpha=1.0):
         """
         Faz a câmera seguir o Player (Panning)
+        Com alpha < 1 segue a posição interpolada (render entre dois ticks).
         """
-        target_x = target_entity.pos[0]
+        target_x = target_entity.interpolated_pos(alpha)[0]
         
         # Largura da visão atual (considerando zoom)
         view_w = (self.screen_width) / self.zoom_level
@@ -98,32 +129,59 @@ class Camera():
             new_x_min = 0
             new_x_max = view_w
             
-        self.world_window['x_min'] = new_x_min
-        self.world_window['x_max'] = new_x_max
-        self.world_window['y_min'] = 0
-        self.world_window['y_max'] = self.screen_height
-        
-        # Importante: Atualizar a matriz após mover a câmera
-        self._update_transformation_matrix()
+        # Só marca a matriz como suja se a janela realmente se moveu
+        self._set_window(new_x_min, new_x_max, 0, self.screen_height)
 
     def _update_window_size(self, cx, cy):
         new_half_width = (self.screen_width / 2) / self.zoom_level
         new_half_height = (self.screen_height / 2) / self.zoom_level
         
-        self.world_window['x_min'] = cx - new_half_width
-        self.world_window['x_max'] = cx + new_half_width
-        self.world_window['y_min'] = cy - new_half_height
-        self.world_window['y_max'] = cy + new_half_height
+        self._set_window(cx - new_half_width, cx + new_half_width,
+                         cy - new_half_height, cy + new_half_height)
+
+    def is_visible(self, bounds):
+        """
+        Culling pela janela do mundo (já considera o zoom):
+        True se a caixa (x_min, y_min, x_max, y_max) cruza a world_window.
+        """
+        window = self.world_window
+        x_min, y_min, x_max, y_max = bounds
+        return (x_max >= window['x_min'] and x_min <= window['x_max'] and
+                y_max >= window['y_min'] and y_min <= window['y_max'])
 
     def world_to_device(self, v: Vertice) -> Vertice:
         """
         Aplica a Matriz de Transformação M ao vértice.
         """
-        # 1. Converte vértice para coordenadas homogêneas (x, y, 1)
-        vec = np.array([v.x, v.y, 1.0])
-        
-        # 2. Multiplicação Matricial: res = M * v
-        res = self.transform_matrix @ vec
+        # Multiplicação M * (x, y, 1) com floats do Python (sem alocar arrays por vértice)
+        if self._dirty:
+            self._update_transformation_matrix()
+        a, b, c, d, e, f = self._affine
         
-        # 3. Retorna novo vértice com coordenadas de tela (inteiros)
-        return Vertice(int(res[0]), int(res[1]), v.u, v.v)
\ No newline at end of file
+        # Retorna novo vértice com coordenadas de tela (inteiros)
+        return Vertice(int(a * v.x + b * v.y + c), int(d * v.x + e * v.y + f), v.u, v.v)
+
+    def model_view(self, x, y):
+        """
+        Matriz Modelo-Vista de uma entidade na posição (x, y): M_camera * T(x, y).
+        Fica em cache pela chave (posição, versão da câmera) e só é recomposta
+        quando a entidade ou a câmera se movem.
+        """
+        matrix = self.transform_matrix
+        cache = self._model_view_cache
+        if self._model_view_version != self.version or len(cache) >= self.MODEL_VIEW_CACHE_SIZE:
+            cache.clear()
+            self._model_view_version = self.version
+
+        key = (x, y)
+        model_view = cache.get(key)
+        if model_view is None:
+            model_view = cache[key] = matrix @ Matrix3x3.translation(x, y)
+        return model_view
+
+    def buffer_to_device(self, buffer: VertexBuffer, matrix=None) -> VertexBuffer:
+        """
+        Versão para VertexBuffer: transforma todas as partes de uma vez.
+        `matrix` é uma matriz já fundida (ex.: model_view); sem ela, usa a da câmera.
+        """
+        return buffer.transformed(self.transform_matrix if matrix is None else matrix, truncate=True)
@@ -0,0 +1,76 @@
+"""
+Colisão em duas fases sobre arrays de hitboxes (x, y, largura, altura),
+no mesmo formato de Entity.get_hitbox().
+- Fase larga: sweep-and-prune no eixo x (ordena pelo x_min e só pareia
+  caixas cujas faixas em x se sobrepõem).
+- Fase estreita: teste AABB de todos os pares candidatos de uma vez com NumPy.
+"""
+import numpy as np
+
+def hitbox_array(entities):
+    """Hitboxes das entidades num array (N, 4) de (x, y, w, h)."""
+    if not entities:
+        return np.empty((0, 4))
+    return np.array([entity.get_hitbox() for entity in entities], dtype=float)
+
+def overlaps(boxes_a, boxes_b):
+    """
+    Teste AABB elemento a elemento (mesmas desigualdades estritas de check_collision).
+    Aceita arrays (N, 4) ou uma caixa (4,) que é comparada com todas as outras.
+    """
+    a = np.asarray(boxes_a, dtype=float)
+    b = np.asarray(boxes_b, dtype=float)
+    return ((a[..., 0] < b[..., 0] + b[..., 2]) & (a[..., 0] + a[..., 2] > b[..., 0]) &
+            (a[..., 1] < b[..., 1] + b[..., 3]) & (a[..., 1] + a[..., 3] > b[..., 1]))
+
+def sweep_and_prune(boxes):
+    """
+    Fase larga: pares (i, j), i < j, cujas faixas em x se sobrepõem.
+    Com as caixas ordenadas por x_min, as candidatas de i são as seguintes
+    até a primeira cujo x_min passa do x_max de i (busca binária).
+    """
+    boxes = np.asarray(boxes, dtype=float)
+    n = len(boxes)
+    if n < 2:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+    order = np.argsort(boxes[:, 0], kind='stable')
+    x_min = boxes[order, 0]
+    x_max = x_min + boxes[order, 2]
+
+    # Primeira caixa (na ordem) que começa em x >= x_max de cada uma
+    end = np.searchsorted(x_min, x_max, side='left')
+    start = np.arange(1, n + 1)
+    counts = np.maximum(end - start, 0)
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+    first = np.repeat(np.arange(n), counts)
+    # Índice do par dentro do bloco de cada caixa: 0, 1, ..., counts-1
+    block_start = np.repeat(np.cumsum(counts) - counts, counts)
+    second = np.repeat(start, counts) + (np.arange(total) - block_start)
+
+    i, j = order[first], order[second]
+    return np.minimum(i, j), np.maximum(i, j)
+
+def overlapping_pairs(boxes):
+    """Todos os pares (i, j) de caixas que se sobrepõem: fase larga + fase estreita."""
+    i, j = sweep_and_prune(boxes)
+    if len(i) == 0:
+        return []
+    boxes = np.asarray(boxes, dtype=float)
+    hit = overlaps(boxes[i], boxes[j])
+    return list(zip(i[hit].tolist(), j[hit].tolist()))
+
+def collide(entities):
+    """Pares de entidades cujas hitboxes se sobrepõem neste tick (uma chamada para todas)."""
+    pairs = overlapping_pairs(hitbox_array(entities))
+    return [(entities[i], entities[j]) for i, j in pairs]
+
+def query_box(entities, box):
+    """Entidades cuja hitbox cruza a caixa (x, y, w, h), na ordem da lista."""
+    if not entities:
+        return []
+    hit = overlaps(hitbox_array(entities), box)
+    return [entity for entity, h in zip(entities, hit.tolist()) if h]
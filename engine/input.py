@@ -6,8 +6,10 @@ class InputHandler:
         self.mouse_pos = (0, 0)
         self.mouse_clicked = False
         self.events = [] 
+        self.frame_ms = 0 # Duração do quadro (ms), informada pelo loop principal
 
-    def update(self):
+    def update(self, frame_ms=0):
+        self.frame_ms = frame_ms
         self.mouse_clicked = False
         self.keys = pygame.key.get_pressed()
         self.events = pygame.event.get()
@@ -24,6 +26,9 @@ class InputHandler:
         
         return True
 
+    def close(self):
+        pass
+
     def is_key_pressed(self, key):
         return self.keys[key] if key < len(self.keys) else False
     
@@ -49,4 +54,31 @@ class InputHandler:
     def debug_hide_entity(self):
         if self.is_key_pressed(pygame.K_t): return 1
         if self.is_key_pressed(pygame.K_y): return 2
-        return 0
\ No newline at end of file
+        return 0
+
+class ScriptedInput(InputHandler):
+    """
+    Entrada roteirizada para rodar sem janela (simulação headless, testes de balanceamento).
+    Mesma interface do InputHandler, mas as teclas vêm de `script(tick)`, que retorna
+    as teclas seguradas naquele tick; "acabou de apertar" = segurada agora e não no tick anterior.
+    """
+    def __init__(self, script):
+        super().__init__()
+        self.script = script
+        self.tick = 0
+        self.held = frozenset()
+        self.pressed = frozenset()
+
+    def update(self, frame_ms=0):
+        self.frame_ms = frame_ms
+        held = frozenset(self.script(self.tick))
+        self.pressed = held - self.held
+        self.held = held
+        self.tick += 1
+        return True
+
+    def is_key_pressed(self, key):
+        return key in self.held
+
+    def was_key_just_pressed(self, key):
+        return key in self.pressed
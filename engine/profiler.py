@@ -0,0 +1,121 @@
+"""
+Profiler de quadro com overlay (tecla F3 no jogo).
+
+    with profiler.stage("fundo", renderer.drain):
+        ...
+
+Cada estágio soma o seu tempo no quadro; end_frame() guarda os totais numa
+janela deslizante (discard_frame() joga fora os de um quadro que não conta)
+e o overlay mostra p50/p95 de cada estágio em barras desenhadas pelo nosso
+Rasterizer. Desligado, stage() devolve sempre o mesmo
+contexto vazio (sem medir nada), então o custo é só o da chamada.
+"""
+import contextlib
+import time
+from collections import deque
+
+from core.vertice import Vertice
+
+_NULL_STAGE = contextlib.nullcontext()
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'sync', 'start')
+
+    def __init__(self, profiler, name, sync):
+        self.profiler = profiler
+        self.name = name
+        self.sync = sync
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        # O lote de polígonos só é rasterizado no flush: descarrega aqui para
+        # que o custo caia no estágio que o gerou
+        if self.sync is not None: self.sync()
+        elapsed = time.perf_counter() - self.start
+        current = self.profiler._current
+        current[self.name] = current.get(self.name, 0.0) + elapsed
+        return False
+
+class Profiler:
+    WINDOW = 120          # Quadros na janela dos percentis
+    BUDGET_MS = 1000 / 60 # Escala das barras (um quadro a 60 FPS)
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.history = {}   # estágio -> deque de ms por quadro
+        self._current = {}
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.history.clear()
+        self._current.clear()
+
+    def stage(self, name, sync=None):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, sync)
+
+    def end_frame(self):
+        if not self.enabled: return
+        for name, seconds in self._current.items():
+            samples = self.history.get(name)
+            if samples is None:
+                samples = self.history[name] = deque(maxlen=self.WINDOW)
+            samples.append(seconds * 1000)
+        self._current = {}
+
+    def discard_frame(self):
+        """Descarta os estágios medidos no quadro (quadros fora do jogo, ex. pausa)."""
+        self._current = {}
+
+    def percentiles(self, name):
+        """(p50, p95) em ms do estágio na janela atual."""
+        samples = sorted(self.history.get(name, ()))
+        if not samples:
+            return 0.0, 0.0
+        last = len(samples) - 1
+        return samples[last // 2], samples[int(last * 0.95)]
+
+    def draw(self, renderer, font, x=10, y=None):
+        """Barras horizontais por estágio: p95 (claro) com p50 (escuro) por cima."""
+        if not self.enabled or not self.history: return
+
+        row_h, bar_w, label_w = 16, 200, 110
+        names = list(self.history)
+        if y is None:
+            y = renderer.height - 10 - row_h * (len(names) + 1)
+
+        stats = [(name,) + self.percentiles(name) for name in names]
+        scale = max(self.BUDGET_MS, max(p95 for _, _, p95 in stats))
+
+        panel = [Vertice(x - 4, y - 4), Vertice(x + label_w + bar_w + 90, y - 4),
+                 Vertice(x + label_w + bar_w + 90, y + row_h * (len(names) + 1)),
+                 Vertice(x - 4, y + row_h * (len(names) + 1))]
+        renderer.submit(panel, (15, 15, 25))
+
+        # Linha do orçamento de 60 FPS
+        budget_x = x + label_w + bar_w * self.BUDGET_MS / scale
+        renderer.submit([Vertice(budget_x, y), Vertice(budget_x + 1, y),
+                         Vertice(budget_x + 1, y + row_h * len(names)), Vertice(budget_x, y + row_h * len(names))],
+                        (200, 60, 60))
+
+        for i, (name, p50, p95) in enumerate(stats):
+            top, bottom = y + i * row_h + 3, y + (i + 1) * row_h - 3
+            left = x + label_w
+            for value, color in ((p95, (90, 160, 220)), (p50, (40, 90, 160))):
+                right = left + max(1, bar_w * value / scale)
+                renderer.submit([Vertice(left, top), Vertice(right, top),
+                                 Vertice(right, bottom), Vertice(left, bottom)], color)
+
+            renderer.screen.blit(font.render(name, True, (220, 220, 220)), (x, y + i * row_h))
+            text = f"{p50:5.2f} / {p95:5.2f}"
+            renderer.screen.blit(font.render(text, True, (220, 220, 220)), (x + label_w + bar_w + 6, y + i * row_h))
+
+        total = sum(self.percentiles(name)[0] for name in names)
+        renderer.screen.blit(font.render(f"p50 / p95 (ms) | soma p50 {total:.1f} ms", True, (160, 160, 160)),
+                             (x, y + len(names) * row_h))
+
+profiler = Profiler()
@@ -0,0 +1,136 @@
+"""
+Gravação e replay determinísticos da entrada.
+
+O log é binário e compacto: um cabeçalho com a seed do RNG do jogo e, para cada
+quadro, a duração do quadro, as teclas seguradas (máscara de bits sobre
+TRACKED_KEYS), o mouse e os KEYDOWN na ordem em que chegaram (com o texto
+digitado, usado na tela de nome). No replay o loop recebe exatamente os mesmos
+quadros, e o passo fixo executa os mesmos ticks. O tempo real de cada quadro
+é medido à parte, para comparar desempenho entre execuções (o loop do replay
+não limita o FPS, senão todo quadro abaixo do orçamento mediria ~16,7 ms).
+
+    cabeçalho: magic 'JTRP', versão (u8), seed (u64)
+    quadro:    frame_ms (u16), teclas (u32), mouse x/y (i16), flags (u8), nº de eventos (u8)
+    evento:    tecla (u32), tamanho do texto (u8), texto utf-8
+"""
+import struct
+import time
+
+import pygame
+
+from engine.input import InputHandler
+
+MAGIC = b'JTRP'
+VERSION = 1
+
+HEADER = struct.Struct('<4sBQ')
+FRAME = struct.Struct('<HIhhBB')
+EVENT = struct.Struct('<IB')
+
+FLAG_CLICKED = 1
+FLAG_QUIT = 2
+
+# Teclas consultadas pelo jogo com is_key_pressed (posição = bit da máscara)
+TRACKED_KEYS = (
+    pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+    pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s,
+    pygame.K_SPACE, pygame.K_LSHIFT, pygame.K_RETURN, pygame.K_ESCAPE,
+    pygame.K_BACKSPACE, pygame.K_z, pygame.K_x, pygame.K_r,
+    pygame.K_q, pygame.K_t, pygame.K_y,
+)
+
+class RecordingInput(InputHandler):
+    """InputHandler ao vivo que grava cada quadro no log."""
+    def __init__(self, path, seed):
+        super().__init__()
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed))
+
+    def update(self, frame_ms=0):
+        running = super().update(frame_ms)
+
+        mask = 0
+        for bit, key in enumerate(TRACKED_KEYS):
+            if self.keys[key]: mask |= 1 << bit
+
+        keydowns = [event for event in self.events if event.type == pygame.KEYDOWN][:255]
+        flags = (FLAG_CLICKED if self.mouse_clicked else 0) | (0 if running else FLAG_QUIT)
+        mx, my = self.mouse_pos
+
+        chunks = [FRAME.pack(min(frame_ms, 0xFFFF), mask, mx, my, flags, len(keydowns))]
+        for event in keydowns:
+            text = event.unicode.encode('utf-8')[:255]
+            chunks.append(EVENT.pack(event.key, len(text)))
+            chunks.append(text)
+        self.file.write(b''.join(chunks))
+        return running
+
+    def close(self):
+        self.file.close()
+
+class ReplayInput(InputHandler):
+    """
+    Fonte de entrada que lê o log em vez do pygame. O frame_ms gravado substitui
+    o medido, então a simulação avança igual à sessão original.
+    Ao terminar o log, update() retorna False (fim da execução).
+    Os eventos reais continuam sendo consumidos a cada quadro (senão a janela
+    congela); são descartados, menos o QUIT, que encerra o replay.
+    """
+    def __init__(self, path):
+        super().__init__()
+        with open(path, 'rb') as f:
+            self.data = f.read()
+        magic, version, self.seed = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Log de replay inválido: {path}")
+        self.offset = HEADER.size
+        self.held = frozenset()
+        self.frame = 0
+        self.frame_times = [] # Tempo real entre quadros (s, sem limite de FPS), para comparar execuções
+        self._last_time = None
+
+    def update(self, frame_ms=0):
+        now = time.perf_counter()
+        if self._last_time is not None:
+            self.frame_times.append(now - self._last_time)
+        self._last_time = now
+
+        # Esvazia a fila do pygame: só o fechamento da janela importa aqui
+        if any(event.type == pygame.QUIT for event in pygame.event.get()):
+            return False
+        if self.offset >= len(self.data):
+            return False
+
+        frame_ms, mask, mx, my, flags, count = FRAME.unpack_from(self.data, self.offset)
+        self.offset += FRAME.size
+
+        events = []
+        for _ in range(count):
+            key, length = EVENT.unpack_from(self.data, self.offset)
+            self.offset += EVENT.size
+            text = self.data[self.offset : self.offset + length].decode('utf-8')
+            self.offset += length
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=text))
+
+        self.frame_ms = frame_ms
+        self.held = frozenset(key for bit, key in enumerate(TRACKED_KEYS) if mask >> bit & 1)
+        self.events = events
+        self.mouse_pos = (mx, my)
+        self.mouse_clicked = bool(flags & FLAG_CLICKED)
+        self.frame += 1
+        return not flags & FLAG_QUIT
+
+    def is_key_pressed(self, key):
+        return key in self.held
+
+    def timing_summary(self):
+        """Média, p95 e pior tempo de quadro (ms) da execução do replay."""
+        times = sorted(self.frame_times)
+        if not times:
+            return None
+        return {
+            'frames': len(times),
+            'mean_ms': 1000 * sum(times) / len(times),
+            'p95_ms': 1000 * times[int(0.95 * (len(times) - 1))],
+            'max_ms': 1000 * times[-1],
+        }
@@ -0,0 +1,11 @@
+"""
+Gerador aleatório único do jogo.
+Toda aleatoriedade passa por `rng` para que uma sessão gravada (engine/replay.py)
+possa ser reproduzida exatamente a partir da mesma seed.
+"""
+import random
+
+rng = random.Random()
+
+def seed(value):
+    rng.seed(value)
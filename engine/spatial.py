@@ -0,0 +1,92 @@
+import numpy as np
+
+from core.renderer import TILE_WIDTH
+
+class SpatialGrid:
+    """
+    Índice espacial 1-D (grade uniforme no eixo x do mundo).
+    Cada item ocupa as células que a sua faixa [x_min, x_max] cobre; uma consulta
+    visita só as células da faixa pedida em vez de varrer a lista inteira.
+    As consultas devolvem os itens na ordem de inserção (ordem de pintura).
+    """
+    def __init__(self, cell_size=TILE_WIDTH):
+        self.cell_size = cell_size
+        self._cells = {}   # célula -> {item: None}
+        self._spans = {}   # item -> (primeira célula, última célula)
+        self._order = {}   # item -> número de inserção
+        self._next = 0
+
+    def __len__(self):
+        return len(self._spans)
+
+    def __contains__(self, item):
+        return item in self._spans
+
+    def __iter__(self):
+        return iter(sorted(self._spans, key=self._order.__getitem__))
+
+    def _cell_range(self, x_min, x_max):
+        return int(x_min // self.cell_size), int(x_max // self.cell_size)
+
+    def insert(self, item, x_min, x_max):
+        if item in self._spans:
+            self.move(item, x_min, x_max)
+            return
+        self._order[item] = self._next
+        self._next += 1
+        self._add(item, self._cell_range(x_min, x_max))
+
+    def move(self, item, x_min, x_max):
+        """Atualiza a faixa do item; só troca de células se o intervalo de células mudou."""
+        span = self._cell_range(x_min, x_max)
+        old = self._spans.get(item)
+        if old == span: return
+        if old is None:
+            self.insert(item, x_min, x_max)
+            return
+        self._discard(item, old)
+        self._add(item, span)
+
+    def move_many(self, items, x_mins, x_maxs):
+        """move() em lote: as células saem de uma vez dos arrays e só troca quem mudou."""
+        cell = self.cell_size
+        firsts = np.floor_divide(x_mins, cell).astype(np.int64).tolist()
+        lasts = np.floor_divide(x_maxs, cell).astype(np.int64).tolist()
+        spans = self._spans
+        for item, span in zip(items, zip(firsts, lasts)):
+            old = spans.get(item)
+            if old == span: continue
+            if old is None:
+                self._order[item] = self._next
+                self._next += 1
+            else:
+                self._discard(item, old)
+            self._add(item, span)
+
+    def remove(self, item):
+        span = self._spans.pop(item, None)
+        if span is None: return
+        self._discard(item, span)
+        del self._order[item]
+
+    def query(self, x_min, x_max):
+        """Itens cuja faixa de células cruza [x_min, x_max], na ordem de inserção."""
+        first, last = self._cell_range(x_min, x_max)
+        cells = self._cells
+        found = {}
+        for cell in range(first, last + 1):
+            bucket = cells.get(cell)
+            if bucket: found.update(bucket)
+        return sorted(found, key=self._order.__getitem__)
+
+    def _add(self, item, span):
+        self._spans[item] = span
+        for cell in range(span[0], span[1] + 1):
+            self._cells.setdefault(cell, {})[item] = None
+
+    def _discard(self, item, span):
+        for cell in range(span[0], span[1] + 1):
+            bucket = self._cells.get(cell)
+            if bucket is None: continue
+            bucket.pop(item, None)
+            if not bucket: del self._cells[cell]
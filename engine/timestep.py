@@ -0,0 +1,38 @@
+class FixedTimestep:
+    """
+    Acumulador de passo fixo: a simulação sempre avança em ticks de 1/tick_rate s,
+    independente do FPS do render. O tempo de cada quadro entra no acumulador e
+    sai em ticks inteiros; a sobra vira `alpha` (0..1), usado para interpolar as
+    posições entre o estado anterior e o atual na hora de desenhar.
+    `max_steps` evita a "espiral da morte": se um quadro demorar demais, o excesso
+    é descartado (o jogo fica mais lento em vez de travar tentando alcançar).
+    """
+    def __init__(self, tick_rate=60, max_steps=5):
+        self.tick_rate = tick_rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped_steps = 0 # Ticks descartados pelo limite (diagnóstico)
+
+    @property
+    def dt(self):
+        return 1.0 / self.tick_rate
+
+    @property
+    def alpha(self):
+        return min(1.0, self.accumulator / self.dt)
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    def advance(self, frame_dt):
+        """Soma o tempo do quadro e retorna quantos ticks fixos rodar agora."""
+        dt = self.dt
+        self.accumulator += frame_dt
+        steps = int(self.accumulator / dt)
+        if steps > self.max_steps:
+            self.dropped_steps += steps - self.max_steps
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * dt
+        return steps
@@ -1,6 +1,8 @@
 import math
 import time
 
+import numpy as np
+
 class AnimationSystem:
     
     @staticmethod
@@ -24,4 +26,57 @@ class Animator:
         return time.time() - self.start_time
 
     def get_walk_cycle(self, speed=10):
-        return (time.time() * speed) % 1.0
\ No newline at end of file
+        return (time.time() * speed) % 1.0
+
+class KeyframeTrack:
+    """
+    Trilha de keyframes pré-calculados (bake).
+    Amostra `pose_fn(t)` -> lista de pontos (x, y) em `resolution` instantes de [0, period)
+    e guarda tudo num array (K, 2, V). Em tempo de execução só interpola
+    linearmente entre os dois keyframes vizinhos (ou pega o mais próximo).
+    Com loop=False o intervalo é [0, period] fechado e o tempo é limitado às pontas.
+    """
+    def __init__(self, pose_fn, resolution, period=1.0, loop=True):
+        self.resolution = resolution
+        self.period = period
+        self.loop = loop
+        count = resolution if loop else resolution + 1
+        self.frames = np.array([np.array(pose_fn(i * period / resolution), dtype=float).T
+                                for i in range(count)])
+
+    def _position(self, t):
+        pos = t / self.period * self.resolution
+        if self.loop:
+            return pos % self.resolution
+        return min(max(pos, 0.0), self.resolution)
+
+    def nearest(self, t):
+        """Índice do keyframe mais próximo de t (o que sample(t, False) devolve)."""
+        return int(round(self._position(t))) % len(self.frames)
+
+    def sample(self, t, interpolate=True, out=None):
+        """Pose em t; com `out` (array (2, V)), escreve nele em vez de alocar."""
+        if not interpolate:
+            frame = self.frames[self.nearest(t)]
+        else:
+            pos = self._position(t)
+            i = int(pos)
+            frac = pos - i
+            if self.loop:
+                i %= self.resolution
+                j = (i + 1) % self.resolution
+            else:
+                j = min(i + 1, self.resolution)
+            frame = self.frames[i]
+            if frac != 0.0:
+                if out is None:
+                    return frame + (self.frames[j] - frame) * frac
+                np.subtract(self.frames[j], frame, out=out)
+                out *= frac
+                out += frame
+                return out
+
+        if out is None:
+            return frame
+        out[...] = frame
+        return out
@@ -1,3 +1,4 @@
 from .base import Entity
 from .player import Player
-from .enemy import Enemy
\ No newline at end of file
+from .enemy import Enemy
+from .swarm import EnemySwarm
\ No newline at end of file
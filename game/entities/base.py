@@ -1,9 +1,14 @@
 import math
 from core.vertice import Vertice
+from core.vertex_buffer import VertexBuffer
 
 class Entity:
+    # False = não reconstrói a malha a cada update (simulação headless, sem render)
+    build_models = True
+
     def __init__(self, x, y, width=40, height=100):
         self.pos = [x, y]
+        self.prev_pos = None # Posição no tick anterior (interpolação do render)
         self.vel = [0, 0]
         self.width = width 
         self.height = height
@@ -13,12 +18,15 @@ class Entity:
         self.facing_right = True 
         self.parts = []
         self.color_tint = (255, 255, 255)
+        self._buffer_cache = None
+        self._bounds_cache = None
 
-    def add_part(self, vertices, color=None, texture=None, gradient=None):
+    def add_part(self, vertices, color=None, texture=None, gradient=None, address=None):
         part = {'vertices': vertices}
         
         if texture is not None:
             part['texture'] = texture
+            if address is not None: part['address'] = address # 'wrap' (padrão) ou 'clamp'
         elif gradient is not None:
             # Suporte a gradiente
             part['gradient'] = gradient
@@ -29,6 +37,56 @@ class Entity:
         
         self.parts.append(part)
 
+    def vertex_buffer(self):
+        """
+        Todas as partes empacotadas num VertexBuffer (uma parte por offset).
+        Fica em cache enquanto a lista de partes não mudar; modelos estáticos
+        (tiles, placas, trens) empacotam uma única vez.
+        """
+        parts = self.parts
+        cached = self._buffer_cache
+        if cached is None or cached[0] is not parts or cached[1] != len(parts):
+            buffer = VertexBuffer.from_parts([part['vertices'] for part in parts])
+            self._buffer_cache = cached = (parts, len(parts), buffer)
+        return cached[2]
+
+    def world_bounds(self, pos=None):
+        """
+        Caixa envolvente (x_min, y_min, x_max, y_max) no mundo (em `pos`, padrão self.pos).
+        A caixa do modelo fica em cache junto com o VertexBuffer; só a posição é somada.
+        """
+        buffer = self.vertex_buffer()
+        cached = self._bounds_cache
+        if cached is None or cached[0] is not buffer:
+            self._bounds_cache = cached = (buffer, buffer.bounds())
+        x_min, y_min, x_max, y_max = cached[1]
+        x, y = self.pos if pos is None else pos
+        return (x_min + x, y_min + y, x_max + x, y_max + y)
+
+    # --- INTERPOLAÇÃO (passo fixo) ---
+    def snapshot(self):
+        """Guarda a posição atual como a do tick anterior. Chamar antes de cada tick."""
+        if self.prev_pos is None:
+            self.prev_pos = [self.pos[0], self.pos[1]]
+        else:
+            self.prev_pos[0], self.prev_pos[1] = self.pos[0], self.pos[1]
+
+    def interpolated_pos(self, alpha):
+        """Posição entre o tick anterior e o atual (alpha 0..1) para o render."""
+        pos, prev = self.pos, self.prev_pos
+        if prev is None or alpha >= 1.0:
+            return pos[0], pos[1]
+        return (prev[0] + (pos[0] - prev[0]) * alpha,
+                prev[1] + (pos[1] - prev[1]) * alpha)
+
+    def sprite_key(self):
+        """
+        Chave do sprite pré-rasterizado (ver core.sprite_cache).
+        None = as partes são rasterizadas a cada quadro. Entidades cuja geometria
+        depende só da chave (estáticas, ou uma pose) sobrescrevem para ligar o cache.
+        """
+        return None
+
     def take_damage(self, amount):
         self.health -= amount
         if self.health <= 0:
@@ -39,6 +97,7 @@ class Entity:
         return (self.pos[0] - self.width // 2, self.pos[1] - self.height, self.width, self.height)
 
     def check_collision(self, other_entity):
+        # Um par só: floats puros. Muitos pares de uma vez: engine.collision.collide
         r1 = self.get_hitbox()
         r2 = other_entity.get_hitbox()
         return (r1[0] < r2[0] + r2[2] and r1[0] + r1[2] > r2[0] and r1[1] < r2[1] + r2[3] and r1[1] + r1[3] > r2[1])
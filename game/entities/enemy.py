@@ -1,9 +1,20 @@
 from .base import Entity
 from core.vertice import Vertice
-import random
+from core.vertex_buffer import VertexBuffer
+from collections import OrderedDict
 import math
 
 class Enemy(Entity):
+    # --- CACHE DE MALHAS POR POSE ---
+    # A geometria só depende do tipo, da direção, da fase da animação e do
+    # "flash" de ataque. sin(8t), sin(6t) e sin(4t) se repetem a cada pi segundos,
+    # então a fase é animation_timer mod pi, quantizada em ANIMATION_STEPS poses.
+    # Inimigos na mesma pose compartilham a mesma lista de partes (imutável),
+    # o VertexBuffer e a caixa do modelo (world_bounds não recalcula por inimigo).
+    ANIMATION_STEPS = 64
+    MESH_CACHE_SIZE = 256
+    _mesh_cache = OrderedDict()
+
     def __init__(self, x, y, enemy_type="robot"):
         # Hitbox varia por tipo
         w, h = (70, 100) if enemy_type == "boss" else (50, 80)
@@ -43,7 +54,7 @@ class Enemy(Entity):
         self.target = player
         dx = player.pos[0] - self.pos[0]
         dy = player.pos[1] - self.pos[1]
-        dist = (dx**2 + dy**2)**0.5
+        dist = math.hypot(dx, dy)
         target_y_dist = abs(dy)
         
         # IA de Perseguição
@@ -61,7 +72,8 @@ class Enemy(Entity):
         if dist < self.attack_range and target_y_dist < 20 and self.attack_cooldown <= 0:
             self.attack_player(player)
 
-        self.rebuild_model()
+        if self.build_models:
+            self.rebuild_model()
 
     def attack_player(self, player):
         player.take_damage(self.damage)
@@ -69,13 +81,41 @@ class Enemy(Entity):
         # Pequeno pulo ao atacar
         self.pos[1] -= 5 
 
+    def pose_key(self):
+        phase = int((self.animation_timer % math.pi) / math.pi * self.ANIMATION_STEPS)
+        return (self.enemy_type, self.facing_right, phase, self.attack_cooldown > 1.3)
+
+    def sprite_key(self):
+        return ('enemy',) + self.pose_key()
+
     def rebuild_model(self):
+        key = self.pose_key()
+        cache = Enemy._mesh_cache
+        mesh = cache.get(key)
+        if mesh is None:
+            _, _, phase, flashing = key
+            parts = self._build_model(phase * math.pi / self.ANIMATION_STEPS, flashing)
+            buffer = VertexBuffer.from_parts([part['vertices'] for part in parts])
+            mesh = (parts, buffer, buffer.bounds())
+            cache[key] = mesh
+            if len(cache) > self.MESH_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+
+        parts, buffer, bounds = mesh
+        self.parts = parts
+        self._buffer_cache = (parts, len(parts), buffer)
+        self._bounds_cache = (buffer, bounds)
+
+    def _build_model(self, timer, flashing):
+        """Monta as partes da pose (timer quantizado, flash de ataque) e devolve uma tupla imutável."""
         self.parts = []
         d = 1 if self.facing_right else -1
         
         # Animação de caminhada
-        walk_bounce = math.sin(self.animation_timer * 8) * 2
-        walk_cycle = math.sin(self.animation_timer * 8) * 5
+        walk_bounce = math.sin(timer * 8) * 2
+        walk_cycle = math.sin(timer * 8) * 5
         
         # === ROBOT (VERMELHO - MECANICO) ===
         if self.enemy_type == "robot":
@@ -87,7 +127,7 @@ class Enemy(Entity):
             color_glow = (255, 200, 0)
             
             # Pisca quando vai atacar
-            if self.attack_cooldown > 1.3: 
+            if flashing: 
                 color_body = (255, 150, 150)
                 color_eye = (255, 100, 100)
             
@@ -162,7 +202,7 @@ class Enemy(Entity):
             ], color_metal)
             
             # Braços robóticos
-            arm_angle = math.sin(self.animation_timer * 6) * 15
+            arm_angle = math.sin(timer * 6) * 15
             self.add_part([
                 Vertice(-18*d, -70 + walk_bounce), 
                 Vertice(-22*d, -70 + walk_bounce + arm_angle),
@@ -186,7 +226,7 @@ class Enemy(Entity):
             color_jacket = (40, 40, 40)  # Jaqueta preta
             color_eye = (255, 255, 255)
             
-            if self.attack_cooldown > 1.3:
+            if flashing:
                 color_body = (150, 255, 150)
             
             # Moicano punk
@@ -291,7 +331,7 @@ class Enemy(Entity):
             color_eye = (255, 0, 0)
             color_scar = (200, 0, 0)
             
-            if self.attack_cooldown > 1.3:
+            if flashing:
                 color_body = (200, 50, 200)
                 color_eye = (255, 200, 200)
             
@@ -378,7 +418,7 @@ class Enemy(Entity):
             ], color_dark)
             
             # Braços massivos
-            arm_pulse = math.sin(self.animation_timer * 4) * 2
+            arm_pulse = math.sin(timer * 4) * 2
             self.add_part([
                 Vertice(-25*d*scale, -65*scale + walk_bounce), 
                 Vertice(-32*d*scale, -60*scale + walk_bounce + arm_pulse),
@@ -407,3 +447,5 @@ class Enemy(Entity):
                 Vertice(32*d*scale, -20*scale + walk_bounce - arm_pulse), 
                 Vertice(30*d*scale, -20*scale + walk_bounce - arm_pulse)
             ], color_dark)
+
+        return tuple(self.parts)
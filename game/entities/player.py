@@ -1,6 +1,10 @@
 import math
 import pygame
-from core.vertice import Vertice
+import numpy as np
+from core.vertex_buffer import VertexBuffer
+from game.animations import KeyframeTrack
+from engine.spatial import SpatialGrid
+from engine.collision import query_box
 from .base import Entity
 
 def move_towards(current, target, max_delta):
@@ -9,8 +13,12 @@ def move_towards(current, target, max_delta):
     return current + max_delta if target > current else current - max_delta
 
 class Player(Entity):
+    # Keyframes assados por ciclo (caminhada, capa e ataque)
+    BAKE_RESOLUTION = 32
+    INTERPOLATE_KEYFRAMES = True
+
     # Alterado para aceitar score_multiplier
-    def __init__(self, x, y, max_hp=100, score_multiplier=1.0):
+    def __init__(self, x, y, max_hp=100, score_multiplier=1.0, bake_resolution=None, interpolate_keyframes=None):
         super().__init__(x, y, width=50, height=100)
         
         # --- FÍSICA ---
@@ -38,8 +46,13 @@ class Player(Entity):
         self.attack_duration = 0.3
         self.sword_angle = 0
         
-        # Animação
+        # Animação (bake na criação; resoluções iguais reaproveitam o mesmo atlas)
         self.walk_cycle = 0
+        self.atlas = PlayerAtlas.get(bake_resolution or self.BAKE_RESOLUTION)
+        self.interpolate_keyframes = (self.INTERPOLATE_KEYFRAMES if interpolate_keyframes is None
+                                      else interpolate_keyframes)
+        self._assembly = {} # Nº de vértices -> (xy, buffer, partes, cores) da pose atual
+        self._snapped_key = None # Keyframes da última pose sem interpolação
         
         # Cores melhoradas
         self.c_skin = (255, 220, 180)        # Pele mais clara e vibrante
@@ -112,7 +125,8 @@ class Player(Entity):
                 self.attacking = False
                 self.sword_angle = 0
 
-        self.rebuild_model()
+        if self.build_models:
+            self.rebuild_model()
 
     def start_attack(self):
         self.attacking = True
@@ -143,29 +157,25 @@ class Player(Entity):
         hit_y = self.pos[1] - 80
         attack_rect = (hit_x, hit_y, reach, 80)
         
-        for enemy in enemies:
-            if enemy.is_dead: continue
-            ex, ey, ew, eh = enemy.get_hitbox()
+        # Com o índice espacial do level, só os inimigos próximos do golpe são testados
+        if isinstance(enemies, SpatialGrid):
+            enemies = enemies.query(hit_x, hit_x + reach)
+        
+        # Fase estreita em lote: todas as hitboxes contra o golpe de uma vez
+        targets = query_box([enemy for enemy in enemies if not enemy.is_dead], attack_rect)
+        
+        for enemy in targets:
+            enemy.take_damage(35)
+            enemy.pos[0] += 50 if self.facing_right else -50
             
-            if (attack_rect[0] < ex + ew and
-                attack_rect[0] + attack_rect[2] > ex and
-                attack_rect[1] < ey + eh and
-                attack_rect[1] + attack_rect[3] > ey):
-                
-                enemy.take_damage(35)
-                enemy.pos[0] += 50 if self.facing_right else -50
-                
-                # --- RECOMPENSA ESCALADA ---
-                if enemy.is_dead:
-                    # Base 100 * Multiplicador da dificuldade
-                    points = int(100 * self.score_multiplier)
-                    self.score += points
-                    print(f"Kill! +{points} pts")
+            # --- RECOMPENSA ESCALADA ---
+            if enemy.is_dead:
+                # Base 100 * Multiplicador da dificuldade
+                points = int(100 * self.score_multiplier)
+                self.score += points
+                print(f"Kill! +{points} pts")
 
     def rebuild_model(self):
-        self.parts = []
-        d = 1 if self.facing_right else -1
-        
         # Ajuste de cores quando morto
         if self.is_dead:
             self.c_skin = (120, 120, 120)
@@ -174,172 +184,174 @@ class Player(Entity):
         
         # Efeito de invencibilidade (piscar)
         if self.invincible_timer > 0 and int(self.invincible_timer * 20) % 2 == 0:
+            self.parts = []
             return 
         
-        # Movimento de caminhada
-        walk_offset = math.sin(self.walk_cycle) * 2 if not self.attacking else 0
-        leg_offset = math.sin(self.walk_cycle) * 5 if not self.attacking else 0
-        
-        # === CAPA (atrás) ===
-        cape_sway = math.sin(self.walk_cycle * 0.8) * 3
-        self.add_part([
-            Vertice(-8*d, -85), 
-            Vertice(-18*d + cape_sway, -75), 
-            Vertice(-18*d + cape_sway, -20),
-            Vertice(-10*d, -30)
-        ], self.c_cape)
-        
+        # Pose montada a partir dos keyframes assados (sem trigonometria por quadro)
+        d = 1 if self.facing_right else -1
+        shine = False
+        progress = 0.0
+        if self.attacking:
+            progress = min(1.0, self.attack_timer / self.attack_duration)
+            shine = self.attack_timer < self.attack_duration * 0.7
+        colors = self.part_colors()
+
+        parts, buffer = self._pose_mesh(d, progress, shine, colors)
+        self.parts = parts
+        self._buffer_cache = (parts, len(parts), buffer)
+
+    def _pose_mesh(self, d, progress, shine, colors):
+        """
+        Escreve a pose direto no buffer do layout (com ou sem brilho), reaproveitando
+        as partes e as cores enquanto não mudarem. Sem interpolação, se os keyframes
+        forem os mesmos da última chamada, nada é copiado.
+        """
+        atlas = self.atlas
+        interpolate = self.interpolate_keyframes
+        verts = 4 + BODY_VERTS + SWORD_VERTS + (4 if shine else 0)
+        entry = self._assembly.get(verts)
+        if entry is None or entry[3] != colors:
+            xy = np.empty((2, verts)) if entry is None else entry[0]
+            buffer = VertexBuffer(xy[0], xy[1], offsets=range(0, verts + 1, 4))
+            parts = [{'vertices': buffer.part(i), 'color': colors[i]} for i in range(buffer.part_count)]
+            entry = self._assembly[verts] = (xy, buffer, parts, colors)
+            self._snapped_key = None
+        xy, buffer, parts, _ = entry
+
+        cape_phase = self.walk_cycle * 0.8
+        if not interpolate:
+            if self.attacking:
+                key = (verts, d, atlas.cape[d].nearest(cape_phase), -1, atlas.attack[d].nearest(progress))
+            else:
+                key = (verts, d, atlas.cape[d].nearest(cape_phase), atlas.walk[d].nearest(self.walk_cycle), -1)
+            if key == self._snapped_key:
+                return parts, buffer
+            self._snapped_key = key
+
+        atlas.cape[d].sample(cape_phase, interpolate, out=xy[:, :4])
+        if self.attacking:
+            # Atacando o corpo fica parado (walk_offset = 0, keyframe 0 da caminhada)
+            xy[:, 4:4 + BODY_VERTS] = atlas.walk[d].frames[0][:, :BODY_VERTS]
+            if shine:
+                atlas.attack[d].sample(progress, interpolate, out=xy[:, 4 + BODY_VERTS:])
+            else:
+                xy[:, 4 + BODY_VERTS:] = atlas.attack[d].sample(progress, interpolate)[:, :SWORD_VERTS]
+        else:
+            atlas.walk[d].sample(self.walk_cycle, interpolate, out=xy[:, 4:])
+
+        self._bounds_cache = None # Mesmo buffer, vértices novos
+        return parts, buffer
+
+    def part_colors(self):
+        # Ordem das partes (importa para sobreposição):
+        # capa, rosto, cabelo, olhos, armadura, 2 detalhes, cinto, fivela,
+        # 2 pernas, 2 botas, braço, lâmina, guarda, cabo, brilho
+        return (
+            self.c_cape, self.c_skin, self.c_hair, (50, 50, 50),
+            self.c_armor, self.c_armor_detail, self.c_armor_detail,
+            self.c_belt, (200, 180, 100),
+            (60, 60, 80), (60, 60, 80), self.c_boots, self.c_boots,
+            self.c_armor, self.c_sword, (180, 160, 100), self.c_sword_handle,
+            (255, 255, 255)
+        )
+
+
+# --- POSES (usadas só no bake dos keyframes) ---
+
+def _quads(*quads):
+    return [point for quad in quads for point in quad]
+
+def _cape_pose(d, cape_phase):
+    # === CAPA (atrás) ===
+    cape_sway = math.sin(cape_phase) * 3
+    return [(-8*d, -85), (-18*d + cape_sway, -75), (-18*d + cape_sway, -20), (-10*d, -30)]
+
+def _body_pose(d, walk_offset, leg_offset):
+    eye_x = 5 if d > 0 else -5
+    return _quads(
         # === CABEÇA ===
         # Rosto
-        self.add_part([
-            Vertice(-12*d, -95 + walk_offset), 
-            Vertice(12*d, -95 + walk_offset), 
-            Vertice(12*d, -75 + walk_offset), 
-            Vertice(-12*d, -75 + walk_offset)
-        ], self.c_skin)
-        
+        [(-12*d, -95 + walk_offset), (12*d, -95 + walk_offset), (12*d, -75 + walk_offset), (-12*d, -75 + walk_offset)],
         # Cabelo
-        self.add_part([
-            Vertice(-14*d, -95 + walk_offset), 
-            Vertice(14*d, -95 + walk_offset), 
-            Vertice(10*d, -88 + walk_offset), 
-            Vertice(-10*d, -88 + walk_offset)
-        ], self.c_hair)
-        
+        [(-14*d, -95 + walk_offset), (14*d, -95 + walk_offset), (10*d, -88 + walk_offset), (-10*d, -88 + walk_offset)],
         # Olhos
-        eye_x = 5 if self.facing_right else -5
-        self.add_part([
-            Vertice((eye_x)*d, -88 + walk_offset), 
-            Vertice((eye_x+3)*d, -88 + walk_offset), 
-            Vertice((eye_x+3)*d, -85 + walk_offset), 
-            Vertice((eye_x)*d, -85 + walk_offset)
-        ], (50, 50, 50))
+        [((eye_x)*d, -88 + walk_offset), ((eye_x+3)*d, -88 + walk_offset), ((eye_x+3)*d, -85 + walk_offset), ((eye_x)*d, -85 + walk_offset)],
         
         # === TORSO ===
         # Corpo principal (armadura)
-        self.add_part([
-            Vertice(-16*d, -75 + walk_offset), 
-            Vertice(16*d, -75 + walk_offset), 
-            Vertice(16*d, -35 + walk_offset), 
-            Vertice(-16*d, -35 + walk_offset)
-        ], self.c_armor)
-        
+        [(-16*d, -75 + walk_offset), (16*d, -75 + walk_offset), (16*d, -35 + walk_offset), (-16*d, -35 + walk_offset)],
         # Detalhes da armadura (linhas decorativas)
-        self.add_part([
-            Vertice(-12*d, -70 + walk_offset), 
-            Vertice(12*d, -70 + walk_offset), 
-            Vertice(12*d, -67 + walk_offset), 
-            Vertice(-12*d, -67 + walk_offset)
-        ], self.c_armor_detail)
-        
-        self.add_part([
-            Vertice(-10*d, -55 + walk_offset), 
-            Vertice(10*d, -55 + walk_offset), 
-            Vertice(10*d, -52 + walk_offset), 
-            Vertice(-10*d, -52 + walk_offset)
-        ], self.c_armor_detail)
-        
+        [(-12*d, -70 + walk_offset), (12*d, -70 + walk_offset), (12*d, -67 + walk_offset), (-12*d, -67 + walk_offset)],
+        [(-10*d, -55 + walk_offset), (10*d, -55 + walk_offset), (10*d, -52 + walk_offset), (-10*d, -52 + walk_offset)],
         # Cinto
-        self.add_part([
-            Vertice(-16*d, -35 + walk_offset), 
-            Vertice(16*d, -35 + walk_offset), 
-            Vertice(16*d, -30 + walk_offset), 
-            Vertice(-16*d, -30 + walk_offset)
-        ], self.c_belt)
-        
+        [(-16*d, -35 + walk_offset), (16*d, -35 + walk_offset), (16*d, -30 + walk_offset), (-16*d, -30 + walk_offset)],
         # Fivela do cinto
-        self.add_part([
-            Vertice(-4*d, -34 + walk_offset), 
-            Vertice(4*d, -34 + walk_offset), 
-            Vertice(4*d, -31 + walk_offset), 
-            Vertice(-4*d, -31 + walk_offset)
-        ], (200, 180, 100))
+        [(-4*d, -34 + walk_offset), (4*d, -34 + walk_offset), (4*d, -31 + walk_offset), (-4*d, -31 + walk_offset)],
         
         # === PERNAS ===
-        # Perna esquerda
-        self.add_part([
-            Vertice(-16*d, -30 + walk_offset), 
-            Vertice(-6*d, -30 + walk_offset), 
-            Vertice(-6*d, 0 + leg_offset), 
-            Vertice(-16*d, 0 - leg_offset)
-        ], (60, 60, 80))
-        
-        # Perna direita
-        self.add_part([
-            Vertice(6*d, -30 + walk_offset), 
-            Vertice(16*d, -30 + walk_offset), 
-            Vertice(16*d, 0 - leg_offset), 
-            Vertice(6*d, 0 + leg_offset)
-        ], (60, 60, 80))
-        
+        [(-16*d, -30 + walk_offset), (-6*d, -30 + walk_offset), (-6*d, 0 + leg_offset), (-16*d, 0 - leg_offset)],
+        [(6*d, -30 + walk_offset), (16*d, -30 + walk_offset), (16*d, 0 - leg_offset), (6*d, 0 + leg_offset)],
         # Botas
-        self.add_part([
-            Vertice(-16*d, -5 - leg_offset), 
-            Vertice(-6*d, -5 + leg_offset), 
-            Vertice(-8*d, 0 + leg_offset), 
-            Vertice(-18*d, 0 - leg_offset)
-        ], self.c_boots)
-        
-        self.add_part([
-            Vertice(6*d, -5 + leg_offset), 
-            Vertice(16*d, -5 - leg_offset), 
-            Vertice(18*d, 0 - leg_offset), 
-            Vertice(8*d, 0 + leg_offset)
-        ], self.c_boots)
-        
-        # === BRAÇO COM ESPADA (animado) ===
-        shoulder_x, shoulder_y = 0, -65 + walk_offset
-        
-        # Polígonos do braço e espada
-        arm_base = [(0, 0), (22*d, 0), (22*d, 12), (0, 12)]
-        sword_blade = [(20*d, -50), (30*d, -50), (30*d, 15), (20*d, 15)]
-        sword_handle = [(20*d, 10), (30*d, 10), (30*d, 18), (20*d, 18)]
-        sword_guard = [(18*d, 8), (32*d, 8), (32*d, 12), (18*d, 12)]
-        
-        # Aplicar rotação da espada
-        rad = math.radians(self.sword_angle if self.facing_right else -self.sword_angle)
-        cos_a, sin_a = math.cos(rad), math.sin(rad)
-        
-        # Rotacionar braço
-        arm_rotated = []
-        for x, y in arm_base:
-            rx = x * cos_a - y * sin_a
-            ry = x * sin_a + y * cos_a
-            arm_rotated.append(Vertice(shoulder_x + rx, shoulder_y + ry))
-        
-        # Rotacionar lâmina
-        blade_rotated = []
-        for x, y in sword_blade:
-            rx = x * cos_a - y * sin_a
-            ry = x * sin_a + y * cos_a
-            blade_rotated.append(Vertice(shoulder_x + rx, shoulder_y + ry))
-        
-        # Rotacionar cabo
-        handle_rotated = []
-        for x, y in sword_handle:
-            rx = x * cos_a - y * sin_a
-            ry = x * sin_a + y * cos_a
-            handle_rotated.append(Vertice(shoulder_x + rx, shoulder_y + ry))
-        
-        # Rotacionar guarda
-        guard_rotated = []
-        for x, y in sword_guard:
-            rx = x * cos_a - y * sin_a
-            ry = x * sin_a + y * cos_a
-            guard_rotated.append(Vertice(shoulder_x + rx, shoulder_y + ry))
-        
-        # Adicionar partes (ordem importa para sobreposição)
-        self.add_part(arm_rotated, self.c_armor)
-        self.add_part(blade_rotated, self.c_sword)
-        self.add_part(guard_rotated, (180, 160, 100))  # Guarda dourada
-        self.add_part(handle_rotated, self.c_sword_handle)
-        
-        # Efeito de brilho na espada quando atacando
-        if self.attacking and self.attack_timer < self.attack_duration * 0.7:
-            shine_offset = 10
-            shine_poly = []
-            for x, y in sword_blade:
-                rx = x * cos_a - y * sin_a
-                ry = x * sin_a + y * cos_a
-                shine_poly.append(Vertice(shoulder_x + rx + shine_offset*d, shoulder_y + ry))
-            self.add_part(shine_poly, (255, 255, 255))
+        [(-16*d, -5 - leg_offset), (-6*d, -5 + leg_offset), (-8*d, 0 + leg_offset), (-18*d, 0 - leg_offset)],
+        [(6*d, -5 + leg_offset), (16*d, -5 - leg_offset), (18*d, 0 - leg_offset), (8*d, 0 + leg_offset)]
+    )
+
+def _sword_pose(d, sword_angle, walk_offset, with_shine):
+    # === BRAÇO COM ESPADA (animado) ===
+    shoulder_x, shoulder_y = 0, -65 + walk_offset
+    
+    arm_base = [(0, 0), (22*d, 0), (22*d, 12), (0, 12)]
+    sword_blade = [(20*d, -50), (30*d, -50), (30*d, 15), (20*d, 15)]
+    sword_handle = [(20*d, 10), (30*d, 10), (30*d, 18), (20*d, 18)]
+    sword_guard = [(18*d, 8), (32*d, 8), (32*d, 12), (18*d, 12)]
+    
+    # Rotação da espada (espelhada conforme a direção)
+    rad = math.radians(sword_angle * d)
+    cos_a, sin_a = math.cos(rad), math.sin(rad)
+    
+    def rotate(points, offset_x=0):
+        return [(shoulder_x + x * cos_a - y * sin_a + offset_x, shoulder_y + x * sin_a + y * cos_a)
+                for x, y in points]
+    
+    # Ordem: braço, lâmina, guarda, cabo (e brilho por cima)
+    points = _quads(rotate(arm_base), rotate(sword_blade), rotate(sword_guard), rotate(sword_handle))
+    if with_shine:
+        shine_offset = 10
+        points += rotate(sword_blade, shine_offset * d)
+    return points
+
+def _walk_pose(d, walk_phase):
+    # Corpo + espada em repouso, ambos acompanhando a caminhada
+    walk_offset = math.sin(walk_phase) * 2
+    leg_offset = math.sin(walk_phase) * 5
+    return _body_pose(d, walk_offset, leg_offset) + _sword_pose(d, 0, walk_offset, False)
+
+def _attack_pose(d, progress):
+    sword_angle = math.sin(progress * math.pi) * 120
+    return _sword_pose(d, sword_angle, 0, True)
+
+BODY_VERTS = 12 * 4
+SWORD_VERTS = 4 * 4
+
+class PlayerAtlas:
+    """
+    Keyframes do Player assados uma única vez por resolução (compartilhados entre instâncias):
+    capa (fase da capa), caminhada (corpo + espada em repouso) e ataque (espada + brilho),
+    para cada direção.
+    """
+    _baked = {}
+
+    @classmethod
+    def get(cls, resolution):
+        atlas = cls._baked.get(resolution)
+        if atlas is None:
+            atlas = cls._baked[resolution] = cls(resolution)
+        return atlas
+
+    def __init__(self, resolution):
+        self.resolution = resolution
+        self.cape, self.walk, self.attack = {}, {}, {}
+        for d in (1, -1):
+            self.cape[d] = KeyframeTrack(lambda t, d=d: _cape_pose(d, t), resolution, period=2 * math.pi)
+            self.walk[d] = KeyframeTrack(lambda t, d=d: _walk_pose(d, t), resolution, period=2 * math.pi)
+            self.attack[d] = KeyframeTrack(lambda t, d=d: _attack_pose(d, t), resolution, period=1.0, loop=False)
@@ -0,0 +1,160 @@
+import math
+import numpy as np
+
+from .enemy import Enemy
+
+class EnemySwarm:
+    """
+    Simulação dos inimigos em struct-of-arrays.
+    Posições, velocidades, cooldowns, alcances e tipos ficam em arrays NumPy e
+    a perseguição/ataque de todos avança num único passo vetorizado.
+    Os objetos Enemy continuam existindo como "views" finas para o render:
+    `enemy.pos` é uma linha de `self.pos` e os campos da pose (direção,
+    cooldown, timer da animação) são copiados de volta só quando a pose
+    quantizada muda, que é quando a malha (e o pose_key) mudam; flush_views()
+    copia todos. A faixa em x de cada um (malha + hitbox) também fica em
+    array, para o índice espacial do level (extents()).
+    """
+    # Mesmos valores de Enemy.update / Enemy.attack_player
+    ATTACK_COOLDOWN = 1.5
+    ATTACK_HOP = 5
+    ATTACK_Y_TOLERANCE = 20
+
+    # False = não troca as malhas (simulação headless)
+    build_models = True
+
+    def __init__(self, enemies):
+        self.bind(list(enemies))
+
+    def bind(self, enemies):
+        """(Re)monta os arrays a partir dos inimigos e liga `enemy.pos` às linhas de self.pos."""
+        self.enemies = enemies
+        n = len(enemies)
+        self.pos = np.array([enemy.pos for enemy in enemies], dtype=float).reshape(n, 2)
+        self.speed = np.array([enemy.speed for enemy in enemies], dtype=float)
+        self.cooldown = np.array([enemy.attack_cooldown for enemy in enemies], dtype=float)
+        self.animation_timer = np.array([enemy.animation_timer for enemy in enemies], dtype=float)
+        self.attack_range = np.array([enemy.attack_range for enemy in enemies], dtype=float)
+        self.damage = np.array([enemy.damage for enemy in enemies], dtype=np.int64)
+        self.types = np.array([enemy.enemy_type for enemy in enemies], dtype=object)
+        self.min_dist = np.where(self.types == "boss", 50.0, 40.0)
+        self.facing_right = np.array([enemy.facing_right for enemy in enemies], dtype=bool)
+        self.prev_pos = np.array([enemy.pos if enemy.prev_pos is None else enemy.prev_pos for enemy in enemies], dtype=float).reshape(n, 2)
+        self._pose = np.full((n, 3), -1, dtype=np.int64)  # (fase, direção, flash) da última malha
+        self.alive_mask = np.ones(n, dtype=bool) # Vivos no último passo
+
+        # Faixa em x relativa a pos[0]: hitbox, ampliada pela caixa da malha atual
+        half = np.array([enemy.width // 2 for enemy in enemies], dtype=float)
+        width = np.array([enemy.width for enemy in enemies], dtype=float)
+        self._hitbox_x = np.column_stack((-half, width - half)).reshape(n, 2)
+        self._extent_x = self._hitbox_x.copy()
+
+        for i, enemy in enumerate(enemies):
+            enemy.pos = self.pos[i]
+            enemy.prev_pos = self.prev_pos[i]
+            if enemy.parts: self._fit_mesh(i, enemy)
+
+    def __len__(self):
+        return len(self.enemies)
+
+    def alive(self):
+        return [enemy for enemy in self.enemies if not enemy.is_dead]
+
+    def compact(self):
+        """Descarta os mortos dos arrays (as views dos vivos são religadas)."""
+        self.flush_views()
+        self.bind(self.alive())
+
+    def flush_views(self):
+        """Copia os campos da pose de todos os inimigos para os objetos."""
+        for enemy, cooldown, timer, facing in zip(self.enemies, self.cooldown.tolist(),
+                                                  self.animation_timer.tolist(), self.facing_right.tolist()):
+            enemy.attack_cooldown = cooldown
+            enemy.animation_timer = timer
+            enemy.facing_right = facing
+
+    def extents(self):
+        """(x_min, x_max) no mundo de cada inimigo: malha e hitbox, como GameLevel._extent."""
+        x = self.pos[:, 0, None] + self._extent_x
+        return x[:, 0], x[:, 1]
+
+    def _fit_mesh(self, i, enemy):
+        """Faixa relativa do inimigo i a partir da caixa da malha (em cache junto da pose)."""
+        x_min, _, x_max, _ = enemy.world_bounds(pos=(0.0, 0.0))
+        hit_min, hit_max = self._hitbox_x[i]
+        self._extent_x[i] = (min(x_min, hit_min), max(x_max, hit_max))
+
+    def snapshot(self):
+        """Entity.snapshot de todos de uma vez (prev_pos dos inimigos são views deste array)."""
+        self.prev_pos[:] = self.pos
+
+    def update(self, dt, player):
+        """Um tick de IA para todos os inimigos vivos (equivale a Enemy.update em cada um)."""
+        enemies = self.enemies
+        n = len(enemies)
+        if n == 0: return
+
+        alive = ~np.fromiter((enemy.is_dead for enemy in enemies), dtype=bool, count=n)
+        if 2 * alive.sum() < n:
+            # Metade ou mais mortos: encolhe os arrays
+            self.compact()
+            enemies = self.enemies
+            n = len(enemies)
+            if n == 0: return
+            alive = np.ones(n, dtype=bool)
+        self.alive_mask = alive
+
+        cooldown = self.cooldown
+        cooldown[alive & (cooldown > 0)] -= dt
+        self.animation_timer[alive] += dt
+
+        # Distância ao player antes de mover (igual ao laço original)
+        delta = np.array(player.pos[:2], dtype=float) - self.pos
+        dist = np.hypot(delta[:, 0], delta[:, 1])
+
+        # Perseguição
+        moving = alive & (dist > self.min_dist)
+        direction = delta[moving] / dist[moving, None]
+        self.pos[moving] += direction * (self.speed[moving, None] * dt)
+        self.facing_right[moving] = direction[:, 0] > 0
+
+        # Ataque: poucos por tick, aplicados em ordem como no laço original
+        attacking = (alive & (dist < self.attack_range) &
+                     (np.abs(delta[:, 1]) < self.ATTACK_Y_TOLERANCE) & (cooldown <= 0))
+        for i in np.flatnonzero(attacking).tolist():
+            player.take_damage(self.damage[i].item())
+            cooldown[i] = self.ATTACK_COOLDOWN
+            self.pos[i, 1] -= self.ATTACK_HOP
+
+        self._sync_views(alive, player)
+
+    def _sync_views(self, alive, player):
+        """Copia os campos e troca a malha só de quem mudou de pose (o resto já está em dia)."""
+        phase = ((self.animation_timer % math.pi) / math.pi * Enemy.ANIMATION_STEPS).astype(np.int64)
+        pose = np.column_stack((phase, self.facing_right, self.cooldown > 1.3))
+        changed = alive & (pose != self._pose).any(axis=1)
+        if not changed.any(): return
+        self._pose[changed] = pose[changed]
+
+        index = np.flatnonzero(changed)
+        enemies = self.enemies
+        build_models = self.build_models
+        mesh_x = [] # Caixa em x da malha nova de cada um (vem do cache da pose)
+        for i, cooldown, timer, facing in zip(index.tolist(), self.cooldown[index].tolist(),
+                                              self.animation_timer[index].tolist(),
+                                              self.facing_right[index].tolist()):
+            enemy = enemies[i]
+            enemy.attack_cooldown = cooldown
+            enemy.animation_timer = timer
+            enemy.facing_right = facing
+            enemy.target = player
+            if build_models:
+                enemy.rebuild_model()
+                bounds = enemy._bounds_cache[1]
+                mesh_x.append((bounds[0], bounds[2]))
+
+        if build_models:
+            mesh_x = np.array(mesh_x, dtype=float)
+            hitbox_x = self._hitbox_x[index]
+            self._extent_x[index, 0] = np.minimum(mesh_x[:, 0], hitbox_x[:, 0])
+            self._extent_x[index, 1] = np.maximum(mesh_x[:, 1], hitbox_x[:, 1])
@@ -1,7 +1,10 @@
 import math
+import numpy as np
+
 from core import Vertice
 from core.renderer import TILE_WIDTH
-from .entities import Entity, Enemy
+from engine.spatial import SpatialGrid
+from .entities import Entity, Enemy, EnemySwarm
 
 class EntityTile(Entity):
     def __init__(self, x, y):
@@ -21,6 +24,9 @@ class SunEntity(Entity):
             points.append(Vertice(px, py))
         self.add_part(points, (255, 255, 0)) 
 
+    def sprite_key(self):
+        return ('sun',)
+
 class Sign(Entity):
     def __init__(self, x, y, text_content=""):
         super().__init__(x, y)
@@ -29,6 +35,10 @@ class Sign(Entity):
         self.add_part([Vertice(-100, -130), Vertice(100, -130), Vertice(100, -80), Vertice(-100, -80)], (20, 40, 100))
         self.add_part([Vertice(-105, -135), Vertice(105, -135), Vertice(105, -130), Vertice(-105, -130)], (200, 200, 200))
 
+    def sprite_key(self):
+        # O texto é desenhado à parte (draw_sign_labels): todas as placas são iguais
+        return ('sign',)
+
 class MetroTrain(Entity):
     """Trem de metrô moderno no Level 2 com animação otimizada"""
     def __init__(self, x, y, speed=150, direction=1, level_width=3000):
@@ -177,6 +187,10 @@ class MetroTrain(Entity):
             Vertice(body_left + 30*scale*d, body_bottom + 8*scale)
         ], (60, 60, 70))
     
+    def sprite_key(self):
+        # Geometria fixa: só depende da direção (a escala é a mesma em todos)
+        return ('metro', self.direction, self.scale)
+
     def update(self, dt):
         """Atualiza apenas a posição do trem (OTIMIZADO - sem reconstruir geometria)"""
         # Movimenta o trem
@@ -186,14 +200,17 @@ class MetroTrain(Entity):
         if self.direction > 0:  # Indo para direita
             if self.pos[0] > self.level_width + 600:  # Margem de 600 pixels
                 self.pos[0] = -600
+                self.snapshot() # Teleporte: sem interpolar a volta
         else:  # Indo para esquerda
             if self.pos[0] < -600:
                 self.pos[0] = self.level_width + 600
+                self.snapshot()
 
 class BackgroundTile(EntityTile):
+    parallax = 0.3
+
     def __init__(self, tile_x, VIEW_HEIGHT, level_type=1, texture=None):
         super().__init__(tile_x * TILE_WIDTH, 0)
-        self.parallax = 0.3
         
         x0, x1 = 0, TILE_WIDTH
         
@@ -242,6 +259,7 @@ class BackgroundTile(EntityTile):
 class FloorTile(EntityTile):
     def __init__(self, tile_x, level_type=1):
         super().__init__(tile_x * TILE_WIDTH, 0)
+        self.level_type = level_type
         FLOOR_TOP, FLOOR_BOTTOM = 420, 600
         x0, x1 = 0, TILE_WIDTH
         if level_type == 1:
@@ -254,6 +272,10 @@ class FloorTile(EntityTile):
             self.add_part([Vertice(0, FLOOR_TOP), Vertice(x1, FLOOR_TOP), Vertice(x1, FLOOR_BOTTOM), Vertice(0, FLOOR_BOTTOM)], color=(180, 180, 180))
             self.add_part([Vertice(0, 420), Vertice(x1, 420), Vertice(x1, 430), Vertice(0, 430)], color=(120, 120, 120))
 
+    def sprite_key(self):
+        # Todos os tiles de chão do mesmo level são iguais
+        return ('floor', self.level_type)
+
 class House(Entity):
     def __init__(self, x, y):
         super().__init__(x, y)
@@ -261,6 +283,9 @@ class House(Entity):
         self.add_part([Vertice(-120, -150), Vertice(0, -250), Vertice(120, -150)], color=(180, 60, 60))
         self.add_part([Vertice(-30, -80), Vertice(30, -80), Vertice(30, 0), Vertice(-30, 0)], color=(100, 60, 30))
 
+    def sprite_key(self):
+        return ('house',)
+
 class GameLevel:
     def __init__(self, level_number, screen_height, sky_texture=None):
         self.level_number = level_number
@@ -271,6 +296,13 @@ class GameLevel:
         self.enemies_config = [] 
         self.decorations = [] 
         
+        # Índices espaciais por camada (eixo x do mundo)
+        self.bg_index = SpatialGrid()
+        self.bg_parallax = (BackgroundTile.parallax, BackgroundTile.parallax) # (mín, máx) dos tiles de fundo
+        self.floor_index = SpatialGrid()
+        self.decoration_index = SpatialGrid()
+        self.enemy_index = SpatialGrid()
+        
         # Configs de Level
         if level_number == 1:
             self.width = 4000
@@ -284,6 +316,7 @@ class GameLevel:
 
         self.generate_environment()
         self.setup_enemies()
+        self.build_index()
 
     def generate_environment(self):
         num_tiles = (self.width // TILE_WIDTH) + 4 
@@ -309,6 +342,70 @@ class GameLevel:
             self.decorations.append(SunEntity(600, 80)) 
             self.decorations.append(House(self.width - 200, 500))
 
+    @staticmethod
+    def _extent(entity):
+        """Faixa em x ocupada pela entidade (malha e hitbox)."""
+        hx, _, hw, _ = entity.get_hitbox()
+        if not entity.parts:
+            return hx, hx + hw
+        x_min, _, x_max, _ = entity.world_bounds()
+        return min(x_min, hx), max(x_max, hx + hw)
+
+    def build_index(self):
+        for tile in self.bg_tiles: self.bg_index.insert(tile, *self._extent(tile))
+        if self.bg_tiles:
+            # Cada level pode trocar o parallax nos tiles (trem usa 0.1)
+            values = [tile.parallax for tile in self.bg_tiles]
+            self.bg_parallax = (min(values), max(values))
+        for tile in self.floor_tiles: self.floor_index.insert(tile, *self._extent(tile))
+        for deco in self.decorations: self.decoration_index.insert(deco, *self._extent(deco))
+
+    def update_decorations(self, dt):
+        # Decorações que se movem (trens) trocam de célula no índice
+        for deco in self.decorations:
+            deco.update(dt)
+            self.decoration_index.move(deco, *self._extent(deco))
+
+    def snapshot(self):
+        """Estado do tick anterior de tudo que se move no level (interpolação do render)."""
+        self.swarm.snapshot()
+        for deco in self.decorations: deco.snapshot()
+
+    def sync_enemies(self, enemies):
+        """Mantém o índice de inimigos igual à lista viva (posições e remoções)."""
+        index = self.enemy_index
+        if len(index) != len(enemies):
+            alive = set(enemies)
+            for enemy in list(index):
+                if enemy not in alive: index.remove(enemy)
+
+        # Faixas de todos de uma vez pelos arrays do swarm (mesmas de _extent)
+        swarm = self.swarm
+        x_min, x_max = swarm.extents()
+        items = swarm.enemies
+        if not swarm.alive_mask.all():
+            keep = np.flatnonzero(swarm.alive_mask)
+            items = [items[i] for i in keep.tolist()]
+            x_min, x_max = x_min[keep], x_max[keep]
+        index.move_many(items, x_min, x_max)
+
+    # --- CONSULTAS PELA JANELA DA CÂMERA ---
+    def visible_backgrounds(self, camera):
+        # O fundo usa parallax: a faixa visível é a janela da tela deslocada
+        # pelo parallax dos próprios tiles (faixa de mín a máx, se variar)
+        x_min = camera.world_window['x_min']
+        low, high = self.bg_parallax
+        return self.bg_index.query(x_min * low, x_min * high + camera.screen_width)
+
+    def visible_floor_tiles(self, camera):
+        return self.floor_index.query(camera.world_window['x_min'], camera.world_window['x_max'])
+
+    def visible_decorations(self, camera):
+        return self.decoration_index.query(camera.world_window['x_min'], camera.world_window['x_max'])
+
+    def visible_enemies(self, camera):
+        return self.enemy_index.query(camera.world_window['x_min'], camera.world_window['x_max'])
+
     def setup_enemies(self):
         num_groups = self.width // 600
         for i in range(1, num_groups):
@@ -325,4 +422,7 @@ class GameLevel:
             etype = self.enemy_type
             if self.level_number == 3 and pos == self.enemies_config[-1]: etype = "boss"
             enemies.append(Enemy(pos[0], pos[1], etype))
+        self.swarm = EnemySwarm(enemies)
+        self.enemy_index = SpatialGrid()
+        self.sync_enemies(enemies)
         return enemies
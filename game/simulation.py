@@ -0,0 +1,117 @@
+"""
+Lógica de um tick de jogo, sem nada de render.
+Usada pelo loop do main.py e pela simulação headless (tools/headless_run.py).
+"""
+import contextlib
+import io
+
+from engine.input import ScriptedInput
+from engine.profiler import profiler
+from game.entities import Player
+from game.levels import GameLevel
+
+VIEW_HEIGHT = 600
+LAST_LEVEL = 3
+
+def start_level(level_number, difficulty_hearts, sky_texture=None, old_player=None, texture_cache=None):
+    """Monta o level e o player. Com texture_cache (do Renderer), já escala as fatias do céu."""
+    level = GameLevel(level_number, VIEW_HEIGHT, sky_texture=sky_texture)
+    if texture_cache is not None:
+        texture_cache.prewarm(level.bg_tiles)
+
+    if old_player:
+        player = old_player
+        player.pos = [100, 500]
+        player.snapshot() # Nova fase: não interpola a partir da posição antiga
+        player.health = min(player.health + 20, player.max_health)
+    else:
+        hp_total = difficulty_hearts * 20
+        multiplier = 1.0
+        if difficulty_hearts == 5: multiplier = 1.5
+        elif difficulty_hearts <= 3: multiplier = 3.0
+
+        player = Player(100, 500, max_hp=hp_total, score_multiplier=multiplier)
+
+    enemies = level.spawn_entities()
+    return player, enemies, level
+
+def level_complete(player, level):
+    return player.pos[0] > level.width + 100
+
+def simulate_tick(player, enemies, level, dt, input_handler):
+    """Um tick fixo: player, inimigos (EnemySwarm) e decorações. Retorna a lista de inimigos vivos."""
+    player.snapshot()
+    level.snapshot()
+    with profiler.stage("player"):
+        player.update(dt, input_handler, level.enemy_index)
+
+    enemies = [e for e in enemies if not e.is_dead]
+    # IA de todos os inimigos num passo vetorizado (EnemySwarm)
+    with profiler.stage("inimigos"):
+        level.swarm.update(dt, player)
+        level.sync_enemies(enemies)
+
+    level.update_decorations(dt)
+    return enemies
+
+class HeadlessRun:
+    """
+    Uma partida inteira sem janela nem renderer, o mais rápido que a CPU permitir.
+    `policy(run)` é chamada a cada tick e retorna as teclas seguradas (ver ScriptedInput);
+    ela pode ler o estado atual em run.player / run.enemies / run.level.
+    Sem render, as malhas não são reconstruídas (só a lógica roda).
+    """
+    def __init__(self, difficulty_hearts, policy, tick_rate=60, max_seconds=600, first_level=1,
+                 last_level=LAST_LEVEL, quiet=True):
+        self.difficulty_hearts = difficulty_hearts
+        self.policy = policy
+        self.dt = 1.0 / tick_rate
+        self.max_ticks = int(max_seconds * tick_rate)
+        self.first_level = first_level
+        self.last_level = last_level
+        self.quiet = quiet
+        self.ticks = 0
+
+    def _start(self, state):
+        self.player, self.enemies, self.level = state
+        self.player.build_models = False
+        self.level.swarm.build_models = False
+
+    def run(self):
+        """Roda até vitória, morte ou max_seconds. Retorna um dict com o resultado."""
+        input_handler = ScriptedInput(lambda tick: self.policy(self))
+
+        level_number = self.first_level
+        self._start(start_level(level_number, self.difficulty_hearts))
+        level_ticks = []
+        level_start = 0
+        outcome = "timeout"
+
+        # Os prints de gameplay (kills, morte) viram ruído em milhares de partidas
+        with contextlib.redirect_stdout(io.StringIO()) if self.quiet else contextlib.nullcontext():
+            while self.ticks < self.max_ticks:
+                input_handler.update()
+                self.enemies = simulate_tick(self.player, self.enemies, self.level, self.dt, input_handler)
+                self.ticks += 1
+
+                if self.player.is_dead:
+                    outcome = "dead"
+                    break
+                if level_complete(self.player, self.level):
+                    level_ticks.append(self.ticks - level_start)
+                    level_start = self.ticks
+                    level_number += 1
+                    if level_number > self.last_level:
+                        outcome = "victory"
+                        break
+                    self._start(start_level(level_number, self.difficulty_hearts, old_player=self.player))
+
+        return {
+            'outcome': outcome,
+            'level': level_number if outcome != "victory" else self.last_level,
+            'ticks': self.ticks,
+            'seconds': self.ticks * self.dt,
+            'level_seconds': [ticks * self.dt for ticks in level_ticks],
+            'score': self.player.score,
+            'health': self.player.health,
+        }
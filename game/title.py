@@ -2,6 +2,8 @@ import pygame
 import math
 from core.vertice import Vertice
 from core.rasterizer import Rasterizer
+from core.texture import Texture
+from engine.rng import rng
 
 # --- FONTE VETORIAL ---
 VECTOR_FONT = {
@@ -29,13 +31,19 @@ VECTOR_FONT = {
     'M': [ [(0, 1), (0, 0), (0.5, 0.5), (1, 0), (1, 1)] ] 
 }
 
+GRID_COLOR = (255, 0, 255)
+# Cor transparente da camada estática (não aparece em nada do título)
+STATIC_KEY = (1, 2, 3)
+
 class TitleScreen:
     def __init__(self, width, height):
         self.width = width
         self.height = height
         self.blink_timer = 0
-        self.is_drawn = False 
-        self.building_texture = self.generate_building_texture()
+        self.is_drawn = False # False = camada estática precisa ser refeita
+        self.static_layer = None
+        self.grid_line = None
+        self.building_texture = Texture(self.generate_building_texture())
 
     def generate_building_texture(self):
         w, h = 64, 64
@@ -43,10 +51,9 @@ class TitleScreen:
         surface.fill((20, 10, 30))
         color_win = (200, 200, 100) 
         color_off = (10, 5, 15)
-        import random
         for y in range(4, h, 12):
             for x in range(4, w, 12):
-                color = color_win if random.random() > 0.3 else color_off
+                color = color_win if rng.random() > 0.3 else color_off
                 pygame.draw.rect(surface, color, (x, y, 6, 8))
         return surface
 
@@ -58,39 +65,51 @@ class TitleScreen:
         fator = (math.sin(tempo * 0.5) + 1) / 2
         cor_topo = Rasterizer.interpola_cor(topo1, topo2, fator)
         altura_horizonte = self.height // 2
-        for y in range(altura_horizonte):
-            t = y / altura_horizonte
-            cor = Rasterizer.interpola_cor(cor_topo, base, t)
-            renderer.draw_primitive_line(Vertice(0, y), Vertice(self.width, y), cor)
+        # Um polígono com gradiente (mesmas cores por linha que as retas de antes)
+        ceu = [Vertice(0, 0), Vertice(self.width, 0), Vertice(self.width, altura_horizonte), Vertice(0, altura_horizonte)]
+        renderer.render_gradient_polygon(ceu, cor_topo, base)
 
     def draw_arcade_grid(self, renderer):
         horizonte = self.height // 2
-        centro_x = self.width // 2
-        cor_grid = (255, 0, 255)
         tempo = pygame.time.get_ticks() / 1000
         deslocamento = (tempo * 200) % 40
         
-        # Linhas Horizontais (Movimento)
+        # Linhas Horizontais (Movimento): a reta foi rasterizada uma vez (grid_line)
+        # e só recebe blit na linha em que o draw_line a desenharia
         for i in range(1, 20):
             y = horizonte + i * i * 2 - deslocamento
             if y < self.height:
-                renderer.draw_primitive_line(Vertice(0, y), Vertice(self.width, y), cor_grid)
+                renderer.screen.blit(self.grid_line, (0, int(y)))
+
+    def draw_grid_verticals(self, renderer):
+        horizonte = self.height // 2
+        centro_x = self.width // 2
         
-        # Linhas Verticais
+        # Linhas Verticais (fixas)
         for i in range(-12, 13):
             x = centro_x + i * 40
-            renderer.draw_primitive_line(Vertice(centro_x, horizonte), Vertice(x, self.height), cor_grid)
+            renderer.draw_primitive_line(Vertice(centro_x, horizonte), Vertice(x, self.height), GRID_COLOR)
 
     def reset(self):
         self.is_drawn = False
         self.blink_timer = 0
 
-    def draw(self, renderer):
-        # if not self.is_drawn:
-            # Fundo Arcade Novo
-            self.draw_arcade_sky(renderer)
-            self.draw_arcade_grid(renderer)
-            
+    def build_static_layer(self, renderer):
+        """
+        Tudo que não anima (verticais da grade, prédios, lua, título e poça),
+        desenhado uma vez numa superfície com colorkey, e a reta horizontal
+        da grade. Refeitas só no reset() ou se o tamanho mudar.
+        """
+        self.grid_line = pygame.Surface((self.width, 1)).convert()
+        with renderer.render_target(self.grid_line):
+            renderer.draw_primitive_line(Vertice(0, 0), Vertice(self.width, 0), GRID_COLOR)
+
+        layer = pygame.Surface((self.width, self.height)).convert()
+        layer.fill(STATIC_KEY)
+
+        with renderer.render_target(layer):
+            self.draw_grid_verticals(renderer)
+
             # Prédios 
             p1 = [Vertice(50, 600, u=0, v=5), Vertice(50, 250, u=0, v=0), Vertice(150, 250, u=2, v=0), Vertice(150, 600, u=2, v=5)]
             renderer.render_texture_polygon(p1, self.building_texture)
@@ -101,8 +120,26 @@ class TitleScreen:
             moon_center = Vertice(680, 80)
             renderer.draw_primitive_circle(moon_center, 50, (230, 230, 255))
             renderer.apply_flood_fill(moon_center, (255, 255, 255), (230, 230, 255))
+
+            self.draw_vector_text(renderer, "JATOBA'S", 220, 150, 50, (255, 40, 40), 1.1, 2)
+            self.draw_vector_text(renderer, "ADVENTURE", 260, 220, 30, (255, 255, 255), 1.1)
             
-            # self.is_drawn = True
+            # Poça simples
+            cx, cy = 400, 520 
+            renderer.draw_primitive_ellipse(Vertice(cx, cy), 100, 15, (50, 50, 60))
+
+        layer.set_colorkey(STATIC_KEY, pygame.RLEACCEL)
+        self.static_layer = layer
+        self.is_drawn = True
+
+    def draw(self, renderer):
+        if not self.is_drawn or self.static_layer.get_size() != (self.width, self.height):
+            self.build_static_layer(renderer)
+
+        # Só o céu (cor muda) e as horizontais da grade (rolam) mudam a cada quadro
+        self.draw_arcade_sky(renderer)
+        self.draw_arcade_grid(renderer)
+        renderer.screen.blit(self.static_layer, (0, 0))
 
     def draw_vector_text(self, renderer, text, x, y, size, color, spacing=1.2, thickness=1):
         
@@ -123,13 +160,6 @@ class TitleScreen:
             x += size * spacing
 
     def draw_dynamic(self, renderer):
-        self.draw_vector_text(renderer, "JATOBA'S", 220, 150, 50, (255, 40, 40), 1.1, 2)
-        self.draw_vector_text(renderer, "ADVENTURE", 260, 220, 30, (255, 255, 255), 1.1)
-        
-        # Poça simples
-        cx, cy = 400, 520 
-        renderer.draw_primitive_ellipse(Vertice(cx, cy), 100, 15, (50, 50, 60))
-        
         self.blink_timer += 1
         if self.blink_timer % 60 < 35: 
             self.draw_vector_text(renderer, "PRESS ENTER", 280, 480, 20, (0, 255, 100), 1.1)
\ No newline at end of file
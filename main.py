@@ -1,17 +1,25 @@
 import pygame
 import sys
+import argparse
+import random
 
 from core.renderer import Renderer
+from core.raster_stats import raster_stats
 from core.vertice import Vertice
+from core.texture import Texture
 from engine.camera import Camera
 from engine.input import InputHandler
 from engine.assets_loader import AssetsLoader
-from game.entities import Player, Enemy
-from game.levels import GameLevel, Sign
+from engine.timestep import FixedTimestep
+from engine.replay import RecordingInput, ReplayInput
+from engine import rng
+from engine.profiler import profiler
+from game.entities import Enemy
+from game.levels import Sign
+from game.simulation import start_level, simulate_tick, level_complete, LAST_LEVEL
 from game.title import TitleScreen 
 from game.difficulty import DifficultyScreen
 from game.highscore import HighScoreManager 
-from core.rasterizer import Rasterizer
 
 # --- CONFIGURAÇÕES GERAIS ---
 SCREEN_WIDTH = 800
@@ -24,6 +32,11 @@ MINIMAP_H = 40
 MINIMAP_X = SCREEN_WIDTH - MINIMAP_W - 30
 MINIMAP_Y = 70
 
+# Simulação em passo fixo (independente do FPS do render)
+SIM_TICK_RATE = 60      # Ticks por segundo (ex.: 120 para física mais fina)
+MAX_SIM_STEPS = 5       # Máximo de ticks por quadro (quadros lentos descartam o excesso)
+RENDER_FPS = 60
+
 def draw_sign_labels(renderer, camera, level, font):
     for deco in level.decorations:
         if isinstance(deco, Sign):
@@ -56,7 +69,7 @@ def draw_hearts(renderer, player):
             Vertice(cx - size/2, cy - size), Vertice(cx, cy - size/2),        
             Vertice(cx + size/2, cy - size), Vertice(cx + size, cy - size/2)  
         ]
-        Rasterizer.scanline_fill(renderer.screen, heart_shape, color)
+        renderer.submit(heart_shape, color)
 
 def draw_score(renderer, player, font):
     score_text = f"SCORE: {player.score:06d}"
@@ -126,44 +139,54 @@ def draw_minimap(renderer, player, level, mini_camera):
             # Desenhamos direto na tela do renderer para não perder qualidade alpha
             pygame.draw.polygon(renderer.screen, color, points)
 
-def start_level(level_number, difficulty_hearts, sky_texture, old_player=None):
-    level = GameLevel(level_number, SCREEN_HEIGHT, sky_texture=sky_texture)
-    
-    if old_player:
-        player = old_player
-        player.pos = [100, 500] 
-        player.health = min(player.health + 20, player.max_health)
-    else:
-        hp_total = difficulty_hearts * 20
-        multiplier = 1.0
-        if difficulty_hearts == 5: multiplier = 1.5
-        elif difficulty_hearts <= 3: multiplier = 3.0
-            
-        player = Player(100, 500, max_hp=hp_total, score_multiplier=multiplier)
-        
-    enemies = level.spawn_entities()
-    return player, enemies, level
-
 # Atualizado para receber mini_camera
-def render_game_scene(renderer, camera, mini_camera, level, player, enemies, font_sign, font_score):
+def render_game_scene(renderer, camera, mini_camera, level, player, enemies, font_sign, font_score, show_overdraw=False):
     renderer.screen.fill((0, 0, 0))
-
-    for bg in level.bg_tiles: renderer.render_background(bg, camera)
-    for deco in level.decorations: renderer.render_entity(deco, camera)
-    for fl in level.floor_tiles: renderer.render_entity(fl, camera)
-
-    all_entities = enemies + [player]
-    all_entities.sort(key=lambda e: e.pos[1])
-    for ent in all_entities: renderer.render_entity(ent, camera)
+    renderer.reset_stats()
+    # Depuração (F4): o mundo só conta escritas por pixel e vira mapa de calor
+    if show_overdraw: renderer.begin_overdraw()
+
+    # Todos os polígonos sólidos da cena vão num único lote (uma trava da tela)
+    # Com o profiler ligado, cada estágio descarrega o lote para medir a rasterização
+    renderer.begin_batch()
+    # Só o que o índice espacial do level aponta como próximo da janela da câmera
+    with profiler.stage("fundo", renderer.drain):
+        for bg in level.visible_backgrounds(camera): renderer.render_background(bg, camera)
+    with profiler.stage("decorações", renderer.drain):
+        for deco in level.visible_decorations(camera): renderer.render_entity(deco, camera)
+    with profiler.stage("chão", renderer.drain):
+        for fl in level.visible_floor_tiles(camera): renderer.render_entity(fl, camera)
+
+    with profiler.stage("ordenação"):
+        all_entities = level.visible_enemies(camera) + [player]
+        all_entities.sort(key=lambda e: e.pos[1])
+    with profiler.stage("entidades", renderer.drain):
+        for ent in all_entities: renderer.render_entity(ent, camera)
+    renderer.flush()
+    if show_overdraw: renderer.end_overdraw(font_sign)
     
     if not player.is_dead:
-        draw_hearts(renderer, player)
-        draw_sign_labels(renderer, camera, level, font_sign)
-        draw_score(renderer, player, font_score)
+        with profiler.stage("corações"):
+            draw_hearts(renderer, player)
+        with profiler.stage("placas"):
+            draw_sign_labels(renderer, camera, level, font_sign)
+        with profiler.stage("score"):
+            draw_score(renderer, player, font_score)
         # Passamos a mini_camera aqui
-        draw_minimap(renderer, player, level, mini_camera)
-
-def main():
+        with profiler.stage("minimapa"):
+            draw_minimap(renderer, player, level, mini_camera)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Jatobá's Adventure")
+    parser.add_argument("--seed", type=int, help="seed do RNG do jogo (padrão: aleatória)")
+    parser.add_argument("--record", metavar="ARQUIVO", help="grava a entrada da sessão num log binário")
+    parser.add_argument("--replay", metavar="ARQUIVO", help="reproduz uma sessão gravada com --record")
+    parser.add_argument("--raster-stats", metavar="ARQUIVO",
+                        help="conta o trabalho do rasterizador por quadro e grava em CSV (ou JSON, se .json)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     pygame.init()
     pygame.font.init() 
 
@@ -172,18 +195,32 @@ def main():
         font_info = pygame.font.SysFont('arial', 30, bold=True)
         font_sign = pygame.font.SysFont('arial', 20, bold=True)
         font_score = pygame.font.SysFont('consolas', 28, bold=True) 
+        font_profiler = pygame.font.SysFont('consolas', 13)
     except:
         font_gameover = pygame.font.Font(None, 70)
         font_info = pygame.font.Font(None, 40)
         font_sign = pygame.font.Font(None, 25)
         font_score = pygame.font.Font(None, 35)
+        font_profiler = pygame.font.Font(None, 16)
 
     renderer = Renderer(SCREEN_WIDTH, SCREEN_HEIGHT)
-    input_sys = InputHandler()
+    # Entrada: ao vivo, gravando ou reproduzindo um log (a seed vem do log no replay)
+    if args.replay:
+        input_sys = ReplayInput(args.replay)
+        seed = input_sys.seed
+    else:
+        seed = args.seed if args.seed is not None else random.getrandbits(63)
+        input_sys = RecordingInput(args.record, seed) if args.record else InputHandler()
+    rng.seed(seed)
+    raster_stats.enabled = bool(args.raster_stats)
     clock = pygame.time.Clock()
+    # No replay o loop roda sem limite de FPS: o tempo medido de cada quadro é só
+    # o trabalho de update + render (a simulação usa a duração gravada)
+    fps_cap = 0 if args.replay else RENDER_FPS
+    timestep = FixedTimestep(SIM_TICK_RATE, MAX_SIM_STEPS)
     
     assets_loader = AssetsLoader()
-    sky_texture = assets_loader.load_texture("assets/textures/sky.png")
+    sky_texture = Texture(assets_loader.load_texture("assets/textures/sky.png"))
     
     # --- CÂMERA PRINCIPAL ---
     # Janela: Móvel (define no update) | Viewport: Tela Inteira (800x600)
@@ -207,13 +244,23 @@ def main():
     level = None
     player_name_input = ""
     blink_cursor = 0
+    show_overdraw = False
+    shown_state = GAME_STATE # Estado do último quadro apresentado
 
     running = True
 
     while running:
-        dt = clock.tick(60) / 1000.0 
-        if dt > 0.05: dt = 0.05
-        running = input_sys.update()
+        running = input_sys.update(clock.tick(fps_cap))
+        # No replay vale a duração gravada do quadro (mesmos ticks da sessão original)
+        frame_dt = input_sys.frame_ms / 1000.0 
+        
+        # F3 liga/desliga o profiler de quadro
+        if input_sys.was_key_just_pressed(pygame.K_F3): profiler.toggle()
+        # F4 troca a cena pelo mapa de calor de overdraw
+        if input_sys.was_key_just_pressed(pygame.K_F4): show_overdraw = not show_overdraw
+        # Janela redesenhada pelo sistema (ex.: descoberta): o próximo quadro vai inteiro
+        if any(evt.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE) for evt in input_sys.events):
+            renderer.invalidate_display()
         
         if GAME_STATE == "MENU":
             if input_sys.was_key_just_pressed(pygame.K_RETURN):
@@ -222,7 +269,7 @@ def main():
             renderer.screen.fill((0,0,0)) 
             title_screen.draw(renderer)
             title_screen.draw_dynamic(renderer)
-            pygame.display.flip()
+            renderer.render_step()
 
         elif GAME_STATE == "DIFFICULTY":
             renderer.screen.fill((0,0,0))
@@ -240,7 +287,9 @@ def main():
             if confirm_selection:
                 current_difficulty_hearts = difficulty_screen.get_selected_hearts()
                 current_level_num = 1 
-                player, enemies, level = start_level(current_level_num, current_difficulty_hearts, sky_texture)
+                player, enemies, level = start_level(current_level_num, current_difficulty_hearts, sky_texture,
+                                                      texture_cache=renderer.texture_cache)
+                timestep.reset()
                 
                 # Reseta câmeras para o novo level (importante se a largura do level mudar)
                 camera = Camera(level.width, SCREEN_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT)
@@ -255,24 +304,26 @@ def main():
 
         elif GAME_STATE == "GAME":
             if not player.is_dead:
-                player.update(dt, input_sys, enemies)
-                camera.follow(player)
-                
-                if player.pos[0] > level.width + 100:
-                    current_level_num += 1
-                    if current_level_num > 3:
-                        GAME_STATE = "VICTORY"
-                    else:
-                        player, enemies, level = start_level(current_level_num, current_difficulty_hearts, sky_texture, player)
-                        camera = Camera(level.width, SCREEN_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT)
-                        mini_camera = Camera(level.width, SCREEN_HEIGHT, MINIMAP_W, MINIMAP_H)
-
-                enemies = [e for e in enemies if not e.is_dead]
-                for enemy in enemies:
-                    enemy.update(dt, player)
+                # Passo fixo: roda quantos ticks couberem no tempo deste quadro
+                dt = timestep.dt
+                for _ in range(timestep.advance(frame_dt)):
+                    enemies = simulate_tick(player, enemies, level, dt, input_sys)
+                    
+                    if level_complete(player, level):
+                        current_level_num += 1
+                        if current_level_num > LAST_LEVEL:
+                            GAME_STATE = "VICTORY"
+                        else:
+                            player, enemies, level = start_level(current_level_num, current_difficulty_hearts, sky_texture, player,
+                                                                  texture_cache=renderer.texture_cache)
+                            camera = Camera(level.width, SCREEN_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT)
+                            mini_camera = Camera(level.width, SCREEN_HEIGHT, MINIMAP_W, MINIMAP_H)
+                    
+                    if GAME_STATE != "GAME" or player.is_dead: break
                 
-                for deco in level.decorations:
-                    deco.update(dt)
+                # Render entre dois ticks: posições interpoladas
+                renderer.interpolation = timestep.alpha
+                camera.follow(player, timestep.alpha)
                 
                 if input_sys.was_key_just_pressed(pygame.K_ESCAPE):
                     GAME_STATE = "PAUSE"
@@ -295,7 +346,7 @@ def main():
             elif input_sys.is_key_pressed(pygame.K_x): camera.set_zoom(1.0)
 
             # Passa a mini_camera aqui
-            render_game_scene(renderer, camera, mini_camera, level, player, enemies, font_sign, font_score)
+            render_game_scene(renderer, camera, mini_camera, level, player, enemies, font_sign, font_score, show_overdraw)
             
             if player.is_dead:
                 overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
@@ -313,10 +364,14 @@ def main():
                 cont_surf = font_info.render(msg, True, (200, 200, 200))
                 renderer.screen.blit(cont_surf, cont_surf.get_rect(center=(SCREEN_WIDTH//2, 400)))
 
-            renderer.render_step()
+            profiler.draw(renderer, font_profiler)
+            with profiler.stage("flip"):
+                # Com a câmera andando quase toda a tela muda: flip direto
+                renderer.render_step(track_dirty=False)
+            profiler.end_frame()
 
         elif GAME_STATE == "PAUSE":
-            render_game_scene(renderer, camera, mini_camera, level, player, enemies, font_sign, font_score)
+            render_game_scene(renderer, camera, mini_camera, level, player, enemies, font_sign, font_score, show_overdraw)
             
             overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
             overlay.fill((0, 0, 0, 150))
@@ -340,6 +395,8 @@ def main():
                 renderer.screen.fill((0,0,0))
 
             renderer.render_step()
+            # A cena da pausa passa pelos estágios do profiler: não entra nos percentis do jogo
+            profiler.discard_frame()
 
         elif GAME_STATE == "VICTORY":
             renderer.screen.fill((20, 20, 50))
@@ -403,6 +460,21 @@ def main():
                 renderer.screen.fill((0,0,0)) 
             renderer.render_step()
 
+        # Troca de tela: o primeiro quadro do novo estado vai inteiro
+        if GAME_STATE != shown_state:
+            renderer.invalidate_display()
+            shown_state = GAME_STATE
+
+        raster_stats.end_frame(SCREEN_WIDTH * SCREEN_HEIGHT)
+
+    input_sys.close()
+    if args.raster_stats:
+        raster_stats.export(args.raster_stats)
+    if args.replay:
+        timing = input_sys.timing_summary()
+        if timing:
+            print("Replay: {frames} quadros | média {mean_ms:.2f} ms | p95 {p95_ms:.2f} ms | pior {max_ms:.2f} ms".format(**timing))
+
     pygame.quit()
     sys.exit()
 
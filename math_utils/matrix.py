@@ -1,8 +1,6 @@
 import numpy as np
 import math
 
-from core.vertice import Vertice
-
 class Matrix3x3:
 
     @staticmethod
@@ -41,14 +39,3 @@ class Matrix3x3:
         for m in matrices:
             result = np.dot(m, result)
         return result
-
-    @staticmethod
-    def apply_transform(vertices, matrix):
-        transformed = []
-        for v in vertices:
-            vec = np.array([v.x, v.y, 1.0])
-            res = matrix @ vec
-            transformed.append(
-                Vertice(res[0], res[1], v.u, v.v)
-            )
-        return transformed
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Varredura de balanceamento em vários processos: para cada dificuldade e cada
+level (1 a 3), roda N partidas headless com um bot de seed própria, espalhadas
+num ProcessPoolExecutor, e agrega tempo de conclusão, mortes e pontuação.
+
+Uso (na raiz do projeto):
+    python -m tools.balance_sweep [--runs N] [--workers W] [--seed S] [--json saida.json]
+
+Cada partida é independente (sem estado compartilhado), então a vazão escala
+com o número de núcleos; os jobs vão em lotes (chunksize) para diluir o custo do IPC.
+"""
+import os
+import sys
+import argparse
+import json
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.simulation import HeadlessRun, LAST_LEVEL
+from tools.headless_run import SeededBot
+
+# Mesmas opções da DifficultyScreen (corações)
+DIFFICULTY_HEARTS = (7, 5, 3)
+
+
+def simulate_job(job):
+    """Uma partida de um level só. Roda no processo filho (precisa ser picklável)."""
+    hearts, level, seed, tick_rate, max_seconds = job
+    run = HeadlessRun(hearts, SeededBot(seed), tick_rate, max_seconds, first_level=level, last_level=level)
+    result = run.run()
+    return hearts, level, seed, result['outcome'], result['seconds'], result['score'], result['ticks']
+
+def _summary(values):
+    if not values:
+        return None
+    values = sorted(values)
+    p90 = statistics.quantiles(values, n=10)[-1] if len(values) > 1 else values[0]
+    return {
+        'mean': statistics.fmean(values),
+        'median': statistics.median(values),
+        'p90': p90,
+        'min': values[0],
+        'max': values[-1],
+    }
+
+def aggregate(rows):
+    """Agrupa por (corações, level): taxa de conclusão, mortes e distribuições."""
+    groups = {}
+    for hearts, level, seed, outcome, seconds, score, _ in rows:
+        groups.setdefault((hearts, level), []).append((outcome, seconds, score))
+
+    report = []
+    for (hearts, level), results in sorted(groups.items(), key=lambda item: (-item[0][0], item[0][1])):
+        cleared = [seconds for outcome, seconds, _ in results if outcome == "victory"]
+        report.append({
+            'hearts': hearts,
+            'level': level,
+            'runs': len(results),
+            'cleared': len(cleared),
+            'deaths': sum(outcome == "dead" for outcome, _, _ in results),
+            'timeouts': sum(outcome == "timeout" for outcome, _, _ in results),
+            'completion_seconds': _summary(cleared),
+            'score': _summary([score for _, _, score in results]),
+        })
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Varredura de balanceamento em vários processos")
+    parser.add_argument("--runs", type=int, default=100, help="partidas por (dificuldade, level)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processos (padrão: núcleos)")
+    parser.add_argument("--seed", type=int, default=0, help="seed base; a partida i usa seed + i")
+    parser.add_argument("--difficulty", type=int, action="append", help="corações (repetível; padrão 7, 5 e 3)")
+    parser.add_argument("--tick-rate", type=int, default=60, help="ticks por segundo simulado")
+    parser.add_argument("--max-seconds", type=float, default=300, help="limite de tempo simulado por level")
+    parser.add_argument("--json", help="salva o relatório agregado neste arquivo")
+    args = parser.parse_args()
+
+    jobs = [(hearts, level, args.seed + i, args.tick_rate, args.max_seconds)
+            for hearts in (args.difficulty or DIFFICULTY_HEARTS)
+            for level in range(1, LAST_LEVEL + 1)
+            for i in range(args.runs)]
+    chunksize = max(1, len(jobs) // (args.workers * 8))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        rows = list(executor.map(simulate_job, jobs, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    report = aggregate(rows)
+    print(f"{'corações':<10}{'level':>6}{'concl.':>8}{'mortes':>8}{'timeout':>9}"
+          f"{'tempo méd.':>12}{'mediana':>9}{'p90':>8}{'score méd.':>12}")
+    for row in report:
+        times = row['completion_seconds']
+        time_text = f"{times['mean']:>11.1f}s{times['median']:>8.1f}s{times['p90']:>7.1f}s" if times else f"{'-':>12}{'-':>9}{'-':>8}"
+        print(f"{row['hearts']:<10}{row['level']:>6}{row['cleared']:>8}{row['deaths']:>8}{row['timeouts']:>9}"
+              f"{time_text}{row['score']['mean']:>12.0f}")
+
+    total_ticks = sum(r[-1] for r in rows)
+    print(f"\n{len(rows)} partidas, {total_ticks} ticks em {elapsed:.2f}s com {args.workers} processos "
+          f"-> {total_ticks / elapsed:,.0f} ticks/s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
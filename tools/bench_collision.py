@@ -0,0 +1,95 @@
+"""
+Benchmark e conferência do engine.collision contra o teste par a par original.
+
+Uso (na raiz do projeto):
+    python -m tools.bench_collision [--repeat N]
+
+Para cada caso, collide() (sweep-and-prune + fase estreita em lote) tem que
+devolver exatamente os mesmos pares que Entity.check_collision em todos os
+N*(N-1)/2 pares, e query_box() as mesmas entidades que o teste de uma caixa
+contra cada hitbox. Os casos incluem caixas encostadas (as desigualdades são
+estritas), caixas idênticas, x_min repetidos e multidões empilhadas no mesmo x.
+"""
+import os
+import sys
+import argparse
+import random
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.collision import collide, query_box
+from game.entities.base import Entity
+
+
+# --- REFERÊNCIA (UM PAR POR VEZ) ---
+
+def pairwise_collide(entities):
+    pairs = []
+    for i, a in enumerate(entities):
+        for b in entities[i + 1:]:
+            if a.check_collision(b):
+                pairs.append((a, b))
+    return pairs
+
+def boxes_overlap(r1, r2):
+    return r1[0] < r2[0] + r2[2] and r1[0] + r1[2] > r2[0] and r1[1] < r2[1] + r2[3] and r1[1] + r1[3] > r2[1]
+
+
+# --- CASOS ---
+
+def _crowd(rng, n, width, y_min=420, y_max=560):
+    """n inimigos (hitbox 50x80, como robôs e punks) espalhados em [0, width]."""
+    return [Entity(rng.uniform(0, width), rng.uniform(y_min, y_max), 50, 80) for _ in range(n)]
+
+def build_cases(rng):
+    # Encostadas lado a lado e em cima (não colidem) e idênticas (colidem)
+    touching = [Entity(100 + 50 * i, 500, 50, 80) for i in range(6)]
+    touching += [Entity(100, 420, 50, 80), Entity(100, 500, 50, 80), Entity(125, 500, 50, 80)]
+    # Mesmo x_min para todos: o sweep-and-prune não descarta nada, tudo sai da fase estreita
+    stacked = [Entity(300, 400 + 30 * i, 50, 80) for i in range(40)]
+    # Tamanhos variados (boss 70x100 no meio)
+    mixed = _crowd(rng, 150, 1500)
+    mixed += [Entity(rng.uniform(0, 1500), rng.uniform(420, 560), 70, 100) for _ in range(10)]
+
+    return [
+        ("Encostadas e idênticas (9)", touching),
+        ("Empilhadas no mesmo x (40)", stacked),
+        ("Tamanhos variados (160)", mixed),
+        ("Level de 4000 px (100)", _crowd(rng, 100, 4000)),
+        ("Horda em 2000 px (500)", _crowd(rng, 500, 2000)),
+        ("Horda em 2000 px (1000)", _crowd(rng, 1000, 2000)),
+    ]
+
+def _pair_ids(pairs):
+    return sorted((id(a), id(b)) if id(a) < id(b) else (id(b), id(a)) for a, b in pairs)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do engine.collision")
+    parser.add_argument("--repeat", type=int, default=5, help="repetições por caso")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    mismatches = 0
+    print(f"{'caso':<32}{'pares':>7}{'par a par':>12}{'collide':>12}{'ganho':>8}  confere")
+    for name, entities in build_cases(rng):
+        expected = pairwise_collide(entities)
+        got = collide(entities)
+        ok = _pair_ids(expected) == _pair_ids(got)
+
+        # query_box: um golpe (caixa do ataque) contra todas as hitboxes
+        box = (entities[0].pos[0] - 40, entities[0].pos[1] - 60, 110, 40)
+        ok = ok and query_box(entities, box) == [e for e in entities if boxes_overlap(e.get_hitbox(), box)]
+        mismatches += not ok
+
+        t_pairwise = min(timeit.repeat(lambda: pairwise_collide(entities), number=1, repeat=args.repeat))
+        t_collide = min(timeit.repeat(lambda: collide(entities), number=1, repeat=args.repeat))
+        print(f"{name:<32}{len(expected):>7}{t_pairwise * 1000:>10.2f}ms{t_collide * 1000:>10.2f}ms"
+              f"{t_pairwise / t_collide:>7.1f}x  {'sim' if ok else 'NÃO'}")
+
+    if mismatches:
+        print(f"\n{mismatches} caso(s) divergem da referência")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
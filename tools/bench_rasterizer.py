@@ -0,0 +1,245 @@
+"""
+Benchmark do Rasterizer contra a implementação original (loop duplo por scanline).
+
+Uso (na raiz do projeto):
+    python -m tools.bench_rasterizer [--repeat N]
+
+Casos medidos:
+    - Círculo de 20 vértices do SunEntity (preenchimento sólido)
+    - Montanha de 7 vértices do BackgroundTile (gradiente)
+    - Parte típica de inimigo (polígono baixo, preenchimento sólido)
+    - Prédio texturizado da tela de título
+
+E o mapeador de textura por span (NumPy) contra o loop por pixel sobre a mesma
+AET, que deve dar o mesmo resultado pixel a pixel (wrap e clamp).
+"""
+import os
+import sys
+import argparse
+import timeit
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from core.vertice import Vertice
+from core.rasterizer import Rasterizer, EdgeTable
+from game.levels import SunEntity, BackgroundTile
+
+
+# --- IMPLEMENTAÇÃO ORIGINAL (REFERÊNCIA) ---
+
+def _legacy_intersections(vertices, y):
+    intersections = []
+    for i in range(len(vertices)):
+        v1, v2 = vertices[i], vertices[(i + 1) % len(vertices)]
+        if int(v1.y) == int(v2.y): continue
+        p1, p2 = (v1, v2) if v1.y < v2.y else (v2, v1)
+        if p1.y <= y < p2.y:
+            x = p1.x + (y - p1.y) * (p2.x - p1.x) / (p2.y - p1.y)
+            intersections.append(x)
+    intersections.sort()
+    return intersections
+
+def legacy_scanline_fill(surface, vertices, color):
+    if len(vertices) < 3: return
+    width, height = surface.get_size()
+    ys = [v.y for v in vertices]
+    y_min = max(0, int(min(ys)))
+    y_max = min(height - 1, int(max(ys)))
+    with pygame.PixelArray(surface) as pixels:
+        raw_color = surface.map_rgb(color)
+        for y in range(y_min, y_max + 1):
+            intersections = _legacy_intersections(vertices, y)
+            for i in range(0, len(intersections), 2):
+                if i + 1 < len(intersections):
+                    x_start = max(0, int(intersections[i]))
+                    x_end = min(width - 1, int(intersections[i+1]))
+                    if x_start < x_end:
+                        pixels[x_start : x_end + 1, y] = raw_color
+
+def legacy_scanline_fill_gradiente(surface, vertices, color_top, color_bottom):
+    if len(vertices) < 3: return
+    width, height = surface.get_size()
+    ys = [v.y for v in vertices]
+    y_min = max(0, int(min(ys)))
+    y_max = min(height - 1, int(max(ys)))
+    poly_height = y_max - y_min
+    if poly_height == 0: poly_height = 1
+    with pygame.PixelArray(surface) as pixels:
+        for y in range(y_min, y_max + 1):
+            factor = (y - y_min) / poly_height
+            raw_color = surface.map_rgb(Rasterizer.interpola_cor(color_top, color_bottom, factor))
+            intersections = _legacy_intersections(vertices, y)
+            for i in range(0, len(intersections), 2):
+                if i + 1 < len(intersections):
+                    x_start = max(0, int(intersections[i]))
+                    x_end = min(width - 1, int(intersections[i+1]))
+                    if x_start < x_end:
+                        pixels[x_start : x_end + 1, y] = raw_color
+
+def legacy_scanline_texture(surface, vertices, texture):
+    if len(vertices) < 3: return
+    width, height = surface.get_size()
+    tex_w, tex_h = texture.get_size()
+    ys = [v.y for v in vertices]
+    y_min = max(0, int(min(ys)))
+    y_max = min(height - 1, int(max(ys)))
+    with pygame.PixelArray(surface) as pixels, pygame.PixelArray(texture) as tex_pixels:
+        for y in range(y_min, y_max + 1):
+            inter = []
+            for i in range(len(vertices)):
+                v1, v2 = vertices[i], vertices[(i + 1) % len(vertices)]
+                if int(v1.y) == int(v2.y): continue
+                p1, p2 = (v1, v2) if v1.y < v2.y else (v2, v1)
+                if p1.y <= y < p2.y:
+                    factor = (y - p1.y) / (p2.y - p1.y)
+                    inter.append((p1.x + factor * (p2.x - p1.x),
+                                  p1.u + factor * (p2.u - p1.u),
+                                  p1.v + factor * (p2.v - p1.v)))
+            inter.sort(key=lambda item: item[0])
+            for i in range(0, len(inter), 2):
+                if i + 1 >= len(inter): continue
+                xa, ua, va = inter[i]
+                xb, ub, vb = inter[i+1]
+                x_start, x_end = int(xa), int(xb)
+                x_clamped_start = max(0, x_start)
+                x_clamped_end = min(width - 1, x_end)
+                seg_w = x_end - x_start
+                if seg_w <= 0: continue
+                inv_w = 1.0 / seg_w
+                du = (ub - ua) * inv_w
+                dv = (vb - va) * inv_w
+                offset = x_clamped_start - x_start
+                curr_u = ua + offset * du
+                curr_v = va + offset * dv
+                for x in range(x_clamped_start, x_clamped_end + 1):
+                    tx = int(curr_u * (tex_w - 1)) % tex_w
+                    ty = int(curr_v * (tex_h - 1)) % tex_h
+                    pixels[x, y] = tex_pixels[tx, ty]
+                    curr_u += du
+                    curr_v += dv
+
+def pixel_loop_scanline_texture(surface, vertices, texture, address=Rasterizer.WRAP):
+    """Mapeamento de textura pixel a pixel sobre a AET (versão anterior ao mapeador por span)."""
+    if len(vertices) < 3: return
+    width, height = surface.get_size()
+    tex_w, tex_h = texture.get_size()
+    ys = [v.y for v in vertices]
+    y_min = max(0, int(min(ys)))
+    y_max = min(height - 1, int(max(ys)))
+
+    def address_coord(value, size):
+        if address == Rasterizer.CLAMP:
+            return min(max(value, 0), size - 1)
+        return value % size
+
+    with pygame.PixelArray(surface) as pixels, pygame.PixelArray(texture) as tex_pixels:
+        for y, active in EdgeTable(vertices, with_uv=True).scan(y_min, y_max):
+            for i in range(0, len(active) - 1, 2):
+                xa, ua, va = active[i][1], active[i][3], active[i][5]
+                xb, ub, vb = active[i+1][1], active[i+1][3], active[i+1][5]
+                x_start, x_end = int(xa), int(xb)
+                x_clamped_start = max(0, x_start)
+                x_clamped_end = min(width - 1, x_end)
+                seg_w = x_end - x_start
+                if seg_w <= 0: continue
+                inv_w = 1.0 / seg_w
+                du = (ub - ua) * inv_w
+                dv = (vb - va) * inv_w
+                offset = x_clamped_start - x_start
+                curr_u = ua + offset * du
+                curr_v = va + offset * dv
+                for x in range(x_clamped_start, x_clamped_end + 1):
+                    tx = address_coord(int(curr_u * (tex_w - 1)), tex_w)
+                    ty = address_coord(int(curr_v * (tex_h - 1)), tex_h)
+                    pixels[x, y] = tex_pixels[tx, ty]
+                    curr_u += du
+                    curr_v += dv
+
+
+# --- CASOS ---
+
+def _to_screen(entity, part_index, dx=0, dy=0):
+    part = entity.parts[part_index]
+    return [Vertice(v.x + entity.pos[0] + dx, v.y + entity.pos[1] + dy, v.u, v.v) for v in part['vertices']]
+
+def build_cases(texture):
+    sun = _to_screen(SunEntity(400, 300), 0)
+    tile = BackgroundTile(0, 600, level_type=1)
+    mountain_part = tile.parts[-1]
+    mountain = _to_screen(tile, len(tile.parts) - 1, dx=200)
+    grad = mountain_part['gradient']
+    enemy_part = [Vertice(380, 400), Vertice(416, 400), Vertice(416, 415), Vertice(380, 415)]
+    building = [Vertice(50, 600, u=0, v=5), Vertice(50, 250, u=0, v=0), Vertice(150, 250, u=2, v=0), Vertice(150, 600, u=2, v=5)]
+
+    return [
+        ("SunEntity (20 vértices, sólido)",
+         lambda s: legacy_scanline_fill(s, sun, (255, 255, 0)),
+         lambda s: Rasterizer.scanline_fill(s, sun, (255, 255, 0))),
+        ("Montanha BackgroundTile (7 vértices, gradiente)",
+         lambda s: legacy_scanline_fill_gradiente(s, mountain, grad['top'], grad['bottom']),
+         lambda s: Rasterizer.scanline_fill_gradiente(s, mountain, grad['top'], grad['bottom'])),
+        ("Parte de inimigo (15 scanlines, sólido)",
+         lambda s: legacy_scanline_fill(s, enemy_part, (200, 50, 50)),
+         lambda s: Rasterizer.scanline_fill(s, enemy_part, (200, 50, 50))),
+        ("Prédio da tela de título (textura)",
+         lambda s: legacy_scanline_texture(s, building, texture),
+         lambda s: Rasterizer.scanline_texture(s, building, texture)),
+    ]
+
+def build_texture_cases(texture):
+    building = [Vertice(50, 600, u=0, v=5), Vertice(50, 250, u=0, v=0), Vertice(150, 250, u=2, v=0), Vertice(150, 600, u=2, v=5)]
+    # Inclinado, saindo pela esquerda da tela e com u/v negativos
+    sheared = [Vertice(-40, 420, u=-1.5, v=2.2), Vertice(60, 120, u=-1.5, v=-0.7), Vertice(380, 90, u=3.1, v=-0.7), Vertice(300, 470, u=3.1, v=2.2)]
+    # u/v passando de [0, 1] para testar a borda esticada
+    stretched = [Vertice(420, 560, u=-0.4, v=1.3), Vertice(450, 200, u=-0.4, v=-0.2), Vertice(780, 230, u=1.6, v=-0.2), Vertice(760, 590, u=1.6, v=1.3)]
+
+    return [
+        ("Prédio da tela de título (wrap)", building, Rasterizer.WRAP),
+        ("Quad inclinado, u/v negativos (wrap)", sheared, Rasterizer.WRAP),
+        ("Quad com u/v fora de [0, 1] (clamp)", stretched, Rasterizer.CLAMP),
+    ]
+
+def _diff_pixels(fn_a, fn_b, size):
+    surf_a = pygame.Surface(size)
+    surf_b = pygame.Surface(size)
+    fn_a(surf_a)
+    fn_b(surf_b)
+    arr_a = pygame.surfarray.array2d(surf_a)
+    arr_b = pygame.surfarray.array2d(surf_b)
+    return int((arr_a != arr_b).sum())
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do Rasterizer contra a implementação original")
+    parser.add_argument("--repeat", type=int, default=50, help="execuções por caso")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    texture = pygame.Surface((64, 64))
+    for y in range(64):
+        for x in range(64):
+            texture.set_at((x, y), ((x * 4) % 256, (y * 4) % 256, ((x ^ y) * 4) % 256))
+
+    print(f"{'caso':<50}{'original':>12}{'atual':>12}{'ganho':>8}{'px dif.':>9}")
+    for name, legacy, current in build_cases(texture):
+        t_old = timeit.timeit(lambda: legacy(screen), number=args.repeat) / args.repeat
+        t_new = timeit.timeit(lambda: current(screen), number=args.repeat) / args.repeat
+        diff = _diff_pixels(legacy, current, screen.get_size())
+        print(f"{name:<50}{t_old * 1e3:>10.3f}ms{t_new * 1e3:>10.3f}ms{t_old / t_new:>7.1f}x{diff:>9}")
+
+    print(f"\n{'textura: loop por pixel x span':<50}{'loop':>12}{'span':>12}{'ganho':>8}{'px dif.':>9}")
+    for name, vertices, address in build_texture_cases(texture):
+        loop = lambda s: pixel_loop_scanline_texture(s, vertices, texture, address)
+        span = lambda s: Rasterizer.scanline_texture(s, vertices, texture, address)
+        t_old = timeit.timeit(lambda: loop(screen), number=args.repeat) / args.repeat
+        t_new = timeit.timeit(lambda: span(screen), number=args.repeat) / args.repeat
+        diff = _diff_pixels(loop, span, screen.get_size())
+        print(f"{name:<50}{t_old * 1e3:>10.3f}ms{t_new * 1e3:>10.3f}ms{t_old / t_new:>7.1f}x{diff:>9}")
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
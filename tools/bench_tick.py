@@ -0,0 +1,78 @@
+"""
+Benchmark do tick de jogo inteiro (simulate_tick) com uma horda de inimigos.
+
+Uso (na raiz do projeto):
+    python -m tools.bench_tick [--enemies 500] [--ticks 600] [--budget 2.0]
+
+Mede o tick completo, não só o passo do EnemySwarm: update do player, IA
+vetorizada, cópia das poses para os objetos Enemy, troca de malhas e
+atualização do índice espacial do level. Roda headless (sem malhas, como o
+tools.headless_run) e com malhas (como no jogo), e compara média e p95 com o
+orçamento por tick.
+"""
+import os
+import sys
+import argparse
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from engine.input import ScriptedInput
+from game.entities import Enemy
+from game.simulation import start_level, simulate_tick
+
+WARMUP_TICKS = 60 # Primeiras poses montam as malhas do cache
+
+def run(enemy_count, ticks, build_models, seed=3):
+    """Tempos (s) de cada tick, depois do aquecimento."""
+    rng = random.Random(seed)
+    player, enemies, level = start_level(1, 5)
+    player.build_models = build_models
+    level.swarm.build_models = build_models
+
+    # Horda de robôs imortais em volta do caminho do player (nenhum sai da conta)
+    enemies = enemies + [Enemy(rng.uniform(0, 2000), rng.uniform(420, 560), "robot")
+                         for _ in range(enemy_count - len(enemies))]
+    for enemy in enemies: enemy.health = float('inf')
+    player.health = player.max_health = float('inf')
+    level.swarm.bind(enemies)
+    level.sync_enemies(enemies)
+
+    # Anda para a direita e para para atacar de tempos em tempos
+    input_handler = ScriptedInput(lambda tick: {pygame.K_RIGHT} if tick % 100 < 60 else {pygame.K_SPACE})
+    dt = 1.0 / 60
+    times = []
+    for _ in range(ticks + WARMUP_TICKS):
+        input_handler.update()
+        start = time.perf_counter()
+        enemies = simulate_tick(player, enemies, level, dt, input_handler)
+        times.append(time.perf_counter() - start)
+    return times[WARMUP_TICKS:]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do tick de jogo com uma horda")
+    parser.add_argument("--enemies", type=int, default=500, help="inimigos na horda")
+    parser.add_argument("--ticks", type=int, default=600, help="ticks medidos")
+    parser.add_argument("--budget", type=float, default=2.0, help="orçamento por tick (ms)")
+    args = parser.parse_args()
+
+    print(f"{args.enemies} inimigos, {args.ticks} ticks (orçamento {args.budget:.1f} ms)")
+    print(f"{'modo':<12}{'média':>10}{'p95':>10}{'pior':>10}")
+    over = False
+    for name, build_models in (("headless", False), ("com malhas", True)):
+        times = sorted(run(args.enemies, args.ticks, build_models))
+        mean = 1000 * sum(times) / len(times)
+        p95 = 1000 * times[int(0.95 * (len(times) - 1))]
+        over = over or p95 > args.budget
+        print(f"{name:<12}{mean:>8.2f}ms{p95:>8.2f}ms{1000 * times[-1]:>8.2f}ms")
+
+    if over:
+        print("\np95 acima do orçamento")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()